@@ -7,3 +7,19 @@ from .greeks import theta
 from .greeks import rho
 from .greeks import vega
 from .greeks import futures
+from .precision import FLOAT64
+from .precision import FLOAT32
+from .precision import get_dtype
+from .precision import set_dtype
+from .precision import precision
+from .instrumentation import profiling
+from .instrumentation import snapshot
+from .instrumentation import enable
+from .instrumentation import disable
+from .instrumentation import reset
+from .instrumentation import dump_json
+from .instrumentation import dump_prometheus
+from .finite_difference import crank_nicolson
+from .rate_curve import RateCurve
+from .fourier import carr_madan
+from .fourier import fft_price
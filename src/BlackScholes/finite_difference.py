@@ -0,0 +1,193 @@
+import numpy
+from scipy.linalg import solve_banded
+
+from . import greeks
+from .instrumentation import instrumented
+from .rate_curve import RateCurve
+
+
+def _operator(s_steps, r, sigma):
+    """Return the sub, main and super diagonals of the Black-Scholes operator.
+
+    On a uniform grid S_i = i * dS the PDE
+        dV/dtau = 0.5 * sigma^2 * S^2 * d2V/dS2 + r * S * dV/dS - r * V
+    discretized with central differences couples each interior node i to its
+    neighbours with coefficients that do not depend on dS.
+    """
+
+    i = numpy.arange(1, s_steps, dtype=numpy.float64)
+    sigma_squared_i_squared = sigma * sigma * i * i
+    lower = 0.5 * (sigma_squared_i_squared - r * i)
+    diagonal = -(sigma_squared_i_squared + r)
+    upper = 0.5 * (sigma_squared_i_squared + r * i)
+    return lower, diagonal, upper
+
+
+def _implicit_band(lower, diagonal, upper, weight):
+    """Banded form of (I - weight * L) as expected by scipy.linalg.solve_banded."""
+
+    band = numpy.zeros((3, diagonal.size))
+    band[0, 1:] = -weight * upper[:-1]
+    band[1, :] = 1.0 - weight * diagonal
+    band[2, :-1] = -weight * lower[1:]
+    return band
+
+
+def _penalized_solve(band, rhs, payoff, tolerance, max_iterations):
+    """Solve the linear complementarity problem V >= payoff with the penalty method.
+
+    Forsyth and Vetzal, "Quadratic convergence for valuing American options
+    using a penalty method", SIAM J. Sci. Comput. 23 (2002). The penalty
+    changes the main diagonal per strike, so each strike is solved on its own.
+    """
+
+    large = 1.0 / tolerance
+    values = numpy.maximum(solve_banded((1, 1), band, rhs), payoff)
+    for j in range(rhs.shape[1]):
+        column_band = band.copy()
+        active = values[:, j] <= payoff[:, j]
+        for _ in range(max_iterations):
+            penalty = numpy.where(active, large, 0.0)
+            column_band[1] = band[1] + penalty
+            column = solve_banded((1, 1), column_band, rhs[:, j] + penalty * payoff[:, j])
+            now_active = column < payoff[:, j]
+            values[:, j] = column
+            if numpy.array_equal(now_active, active):
+                break
+            active = now_active
+    return values
+
+
+@instrumented('crank_nicolson')
+def crank_nicolson(flag, S, K, t, r, sigma, american=False, s_steps=400, t_steps=200, rannacher_steps=2,
+                   width=5.0, tolerance=1e-8, max_iterations=50):
+    """Solve the Black-Scholes PDE with Crank-Nicolson for one or many strikes.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price, or an array of strikes sharing the same grid
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float
+    :param american: allow early exercise, enforced with the penalty method
+    :type american: bool
+    :param s_steps: number of intervals of the stock price grid
+    :type s_steps: int
+    :param t_steps: number of time steps
+    :type t_steps: int
+    :param rannacher_steps: leading time steps each replaced by two fully implicit half steps,
+        which damps the oscillations Crank-Nicolson produces from the kinked payoff
+    :type rannacher_steps: int
+    :param width: the grid extends to max(S * exp(width * sigma * sqrt(t)), 2 * S, 2 * max(K))
+    :type width: float
+    :param tolerance: penalty method tolerance, the penalty factor is 1 / tolerance
+    :type tolerance: float
+    :param max_iterations: penalty iterations per strike and time step
+    :type max_iterations: int
+    :returns: price, delta and gamma read off the grid at S, shaped like K
+
+    All strikes share one grid and one banded matrix, so each time step of a
+    European option is a single scipy.linalg.solve_banded call with one right
+    hand side per strike. The grid is placed so that S falls exactly on a node,
+    delta and gamma are the central differences at that node. With a
+    RateCurve each time step uses the curve's forward rate over the calendar
+    interval it covers.
+
+    Without diffusion, t == 0 or sigma == 0, central differences of the
+    advected payoff oscillate, so the closed form limits of black_scholes,
+    delta and gamma are returned instead; an American option is then worth
+    the larger of that price and its intrinsic value.
+
+    Comparing with the closed form, Hull Example 15.6:
+    S, K, r, sigma, t = 42, 40, 0.10, 0.2, 0.50
+    price, delta, gamma = crank_nicolson('c', S, K, t, r, sigma)
+    abs(price - black_scholes('c', S, K, t, r, sigma)) < 0.005
+    True
+    """
+
+    strikes = numpy.atleast_1d(numpy.asarray(K, dtype=numpy.float64))
+    rannacher_steps = min(rannacher_steps, t_steps)
+
+    if t <= 0 or sigma <= 0:
+        price = greeks.black_scholes(flag, S, strikes, t, r, sigma)
+        delta = greeks.delta(flag, S, strikes, t, r, sigma)
+        gamma = greeks.gamma(S, strikes, t, r, sigma)
+        if american:
+            intrinsic = numpy.maximum(S - strikes, 0.0) if flag == 'c' else numpy.maximum(strikes - S, 0.0)
+            exercise = intrinsic > price
+            price = numpy.where(exercise, intrinsic, price)
+            delta = numpy.where(exercise, 1.0 if flag == 'c' else -1.0, delta)
+            gamma = numpy.where(exercise, 0.0, gamma)
+        if numpy.ndim(K) == 0:
+            return price[0], delta[0], gamma[0]
+        return price, delta, gamma
+
+    # 2 * S keeps S on an interior node, so both neighbours exist for delta and gamma
+    s_max = max(S * numpy.exp(width * sigma * numpy.sqrt(t)), 2.0 * S, 2.0 * strikes.max())
+    node = min(max(1, int(round(s_steps * S / s_max))), s_steps - 1)
+    ds = S / float(node)
+    grid = ds * numpy.arange(s_steps + 1)
+    s_max = grid[-1]
+
+    if flag == 'c':
+        payoff = numpy.maximum(grid[:, None] - strikes, 0.0)
+    else:
+        payoff = numpy.maximum(strikes - grid[:, None], 0.0)
+    interior_payoff = payoff[1:-1]
+
+    curve = r if isinstance(r, RateCurve) else None
+    if curve is not None:
+        r = float(curve.zero_rate(t))
+    dt = t / float(t_steps)
+    schedule = [(0.5 * dt, 1.0)] * (2 * rannacher_steps) + [(dt, 0.5)] * (t_steps - rannacher_steps)
+    operators = {}
+
+    values = payoff.copy()
+    tau = 0.0
+    discount = 1.0
+    for step, theta in schedule:
+        if curve is not None and step:
+            r = float(curve.forward_rate(t - tau - step, t - tau))
+        tau += step
+        discount *= numpy.exp(-r * step)
+        implicit = theta * step
+        explicit = (1.0 - theta) * step
+        if (step, theta, r) not in operators:
+            lower, diagonal, upper = _operator(s_steps, r, sigma)
+            operators[(step, theta, r)] = lower, diagonal, upper, _implicit_band(lower, diagonal, upper, implicit)
+        lower, diagonal, upper, band = operators[(step, theta, r)]
+
+        if flag == 'c':
+            low = numpy.zeros_like(strikes)
+            high = s_max - strikes * discount
+        else:
+            low = strikes if american else strikes * discount
+            high = numpy.zeros_like(strikes)
+
+        rhs = values[1:-1].copy()
+        if explicit:
+            rhs += explicit * (lower[:, None] * values[:-2] + diagonal[:, None] * values[1:-1]
+                               + upper[:, None] * values[2:])
+        rhs[0] += implicit * lower[0] * low
+        rhs[-1] += implicit * upper[-1] * high
+
+        if american:
+            values[1:-1] = _penalized_solve(band, rhs, interior_payoff, tolerance, max_iterations)
+        else:
+            values[1:-1] = solve_banded((1, 1), band, rhs)
+        values[0] = low
+        values[-1] = high
+
+    price = values[node]
+    delta = (values[node + 1] - values[node - 1]) / (2.0 * ds)
+    gamma = (values[node + 1] - 2.0 * values[node] + values[node - 1]) / (ds * ds)
+
+    if numpy.ndim(K) == 0:
+        return price[0], delta[0], gamma[0]
+    return price, delta, gamma
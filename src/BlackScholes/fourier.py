@@ -0,0 +1,165 @@
+import numpy
+from scipy.interpolate import CubicSpline
+
+from .instrumentation import instrumented
+from .rate_curve import _rate
+
+
+def gbm_characteristic_function(u, S, t, r, sigma):
+    """Characteristic function of log S(t) under risk-neutral geometric Brownian motion.
+
+    :param u: frequencies
+    :type u: numpy.ndarray
+    :param S: underlying asset price
+    :type S: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param sigma: annualized volatility
+    :type sigma: float
+    """
+
+    drift = numpy.log(S) + (r - 0.5 * sigma * sigma) * t
+    return numpy.exp(1j * u * drift - 0.5 * sigma * sigma * u * u * t)
+
+
+def merton_characteristic_function(u, S, t, r, sigma, lam, mu_j, sigma_j):
+    """Characteristic function of log S(t) under Merton's jump-diffusion.
+
+    :param lam: jump intensity per year
+    :type lam: float
+    :param mu_j: mean of the log jump size
+    :type mu_j: float
+    :param sigma_j: standard deviation of the log jump size
+    :type sigma_j: float
+
+    Remaining parameters are those of ``gbm_characteristic_function``; the
+    drift is compensated so the discounted price stays a martingale.
+    """
+
+    compensator = numpy.exp(mu_j + 0.5 * sigma_j * sigma_j) - 1.0
+    drift = numpy.log(S) + (r - lam * compensator - 0.5 * sigma * sigma) * t
+    jumps = lam * t * (numpy.exp(1j * u * mu_j - 0.5 * sigma_j * sigma_j * u * u) - 1.0)
+    return numpy.exp(1j * u * drift - 0.5 * sigma * sigma * u * u * t + jumps)
+
+
+def heston_characteristic_function(u, S, t, r, v0, kappa, theta, xi, rho):
+    """Characteristic function of log S(t) under the Heston stochastic volatility model.
+
+    :param v0: initial variance
+    :type v0: float
+    :param kappa: mean reversion speed of the variance
+    :type kappa: float
+    :param theta: long run variance
+    :type theta: float
+    :param xi: volatility of the variance
+    :type xi: float
+    :param rho: correlation between the stock and variance shocks
+    :type rho: float
+
+    Uses the formulation of Albrecher et al., "The little Heston trap" (2007),
+    which stays on the principal branch of the complex logarithm.
+    """
+
+    iu = 1j * u
+    beta = kappa - rho * xi * iu
+    d = numpy.sqrt(beta * beta + xi * xi * (iu + u * u))
+    g = (beta - d) / (beta + d)
+    exp_dt = numpy.exp(-d * t)
+    C = kappa * theta / (xi * xi) * ((beta - d) * t - 2.0 * numpy.log((1.0 - g * exp_dt) / (1.0 - g)))
+    D = (beta - d) / (xi * xi) * (1.0 - exp_dt) / (1.0 - g * exp_dt)
+    return numpy.exp(iu * (numpy.log(S) + r * t) + C + D * v0)
+
+
+CHARACTERISTIC_FUNCTIONS = {
+    'gbm': gbm_characteristic_function,
+    'merton': merton_characteristic_function,
+    'heston': heston_characteristic_function,
+}
+
+
+@instrumented('carr_madan')
+def carr_madan(S, t, r, model='gbm', n=4096, eta=0.25, alpha=1.5, **params):
+    """Return European call prices on a whole log-strike grid from one FFT.
+
+    :param S: underlying asset price
+    :type S: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param model: 'gbm', 'merton' or 'heston'
+    :type model: str
+    :param n: number of grid points, a power of two
+    :type n: int
+    :param eta: spacing of the integration grid, the log-strike spacing is 2 * pi / (n * eta)
+    :type eta: float
+    :param alpha: damping factor of the call price, alpha > 0
+    :type alpha: float
+    :param params: model parameters, e.g. sigma=0.2 for 'gbm'
+    :returns: strikes and call prices, both of length n
+
+    P. Carr and D. Madan, "Option valuation using the fast Fourier transform",
+    Journal of Computational Finance 2 (1999). The damped call price
+    exp(alpha * k) * C(k) has the Fourier transform
+        psi(v) = exp(-r t) phi(v - (alpha + 1) i) / (alpha^2 + alpha - v^2 + i (2 alpha + 1) v)
+    which is integrated with Simpson weights. The log-strike grid is centered
+    on log(S). With a RateCurve the zero rate to t is used, its discount
+    factor is exp(-r t).
+    """
+
+    if model not in CHARACTERISTIC_FUNCTIONS:
+        raise ValueError("model must be one of %s, got %r" % (', '.join(CHARACTERISTIC_FUNCTIONS), model))
+    characteristic_function = CHARACTERISTIC_FUNCTIONS[model]
+    r = float(_rate(r, t, numpy.float64))
+
+    j = numpy.arange(n)
+    v = eta * j
+    spacing = 2.0 * numpy.pi / (n * eta)
+    k0 = numpy.log(S) - 0.5 * n * spacing
+    log_strikes = k0 + spacing * j
+
+    phi = characteristic_function(v - (alpha + 1.0) * 1j, S, t, r, **params)
+    psi = numpy.exp(-r * t) * phi / (alpha * alpha + alpha - v * v + 1j * (2.0 * alpha + 1.0) * v)
+
+    simpson = (3.0 + (-1.0) ** (j + 1)) / 3.0
+    simpson[0] = 1.0 / 3.0
+    transformed = numpy.fft.fft(numpy.exp(-1j * v * k0) * psi * eta * simpson)
+
+    calls = numpy.exp(-alpha * log_strikes) / numpy.pi * transformed.real
+    return numpy.exp(log_strikes), calls
+
+
+@instrumented('fft_price')
+def fft_price(flag, S, K, t, r, model='gbm', n=4096, eta=0.25, alpha=1.5, **params):
+    """Return European option prices at the strikes K from a single Carr-Madan FFT.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike prices, e.g. the index of simulate_options_chain
+    :type K: numpy.ndarray
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+
+    The remaining parameters are those of ``carr_madan``. Call prices are
+    interpolated from the FFT grid onto log(K) with a cubic spline, puts
+    follow from put-call parity.
+
+    Comparing with the closed form under GBM, Hull Example 15.6:
+    S, K, r, sigma, t = 42, 40, 0.10, 0.2, 0.50
+    abs(fft_price('c', S, K, t, r, sigma=sigma) - black_scholes('c', S, K, t, r, sigma)) < 1e-6
+    True
+    """
+
+    r = float(_rate(r, t, numpy.float64))
+    strikes, calls = carr_madan(S, t, r, model=model, n=n, eta=eta, alpha=alpha, **params)
+    K = numpy.asarray(K, dtype=numpy.float64)
+    call = CubicSpline(numpy.log(strikes), calls)(numpy.log(K))
+    if flag == 'c':
+        return call
+    return call - S + K * numpy.exp(-r * t)
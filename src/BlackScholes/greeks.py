@@ -1,8 +1,37 @@
 import numpy
-from scipy.stats import norm
 
+from .instrumentation import instrumented, instrumented_helper
+from .precision import _resolve_dtype, _cast, _log_moneyness, _cdf, _pdf, _prices
+from .rate_curve import _rate, _rate_and_discount
 
-def _d1(S, K, t, r, sigma):  # see Hull 9th Edition , page 338
+
+def _moneyness_limit(numerator):
+    """Limit of d1 as sigma * sqrt(t) goes to zero: +/- inf with the sign of the forward moneyness, 0 at the forward."""
+
+    return numpy.where(numerator == 0, 0., numpy.copysign(numpy.inf, numerator))
+
+
+def _divide(numerator, denominator, limit):
+    """Return numerator / denominator, and ``limit`` wherever the denominator is not positive.
+
+    Expired (t = 0) and zero volatility rows make sigma * sqrt(t) vanish.
+    Rather than branching per contract, the denominator is masked so a whole
+    batch is priced in one pass without NaN, inf or RuntimeWarnings. Batches
+    without such rows only pay for the comparison. ``limit`` is a value or a
+    function of the numerator.
+    """
+
+    valid = denominator > 0
+    if numpy.all(valid):
+        return numerator / denominator
+    quotient = numerator / numpy.where(valid, denominator, 1.)
+    if callable(limit):
+        limit = limit(numerator)
+    return numpy.where(valid, quotient, limit)
+
+
+@instrumented_helper('_d1')
+def _d1(S, K, t, r, sigma, dtype=None):  # see Hull 9th Edition , page 338
     """Calculate the d1 component of the Black-Scholes PDE.
 
     :param S: Underlying Asset / Stock Price
@@ -13,8 +42,14 @@ def _d1(S, K, t, r, sigma):  # see Hull 9th Edition , page 338
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
+
+    Where t <= 0 (expired) or sigma = 0, d1 takes its limit, +/- inf on either
+    side of the forward and 0 at the forward, so every pricer built on it
+    returns intrinsic value and the limiting Greeks.
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 15.6, page 338
 
@@ -33,16 +68,20 @@ def _d1(S, K, t, r, sigma):  # see Hull 9th Edition , page 338
     True
     """
 
+    dtype = _resolve_dtype(dtype)
+    t, sigma = _cast(dtype, t, sigma)
+    t = numpy.maximum(t, 0.)
+    r = _rate(r, t, dtype)
+
     sigma_squared = sigma * sigma
-    numerator = numpy.log(S / float(K)) + (r + sigma_squared / 2.) * t
+    numerator = _log_moneyness(S, K, dtype) + (r + sigma_squared / 2.) * t
     denominator = sigma * numpy.sqrt(t)
 
-    if not denominator:
-        print('')
-    return numerator / denominator
+    return _divide(numerator, denominator, _moneyness_limit)
 
 
-def _d2(S, K, t, r, sigma):  # see Hull 9th Edition , page 338
+@instrumented_helper('_d2')
+def _d2(S, K, t, r, sigma, dtype=None):  # see Hull 9th Edition , page 338
     """Calculate the d2 component of the Black-Scholes PDE.
 
     :param S: underlying asset price
@@ -53,8 +92,10 @@ def _d2(S, K, t, r, sigma):  # see Hull 9th Edition , page 338
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 15.6, page 338
 
@@ -73,10 +114,14 @@ def _d2(S, K, t, r, sigma):  # see Hull 9th Edition , page 338
     True
     """
 
-    return _d1(S, K, t, r, sigma) - sigma * numpy.sqrt(t)
+    dtype = _resolve_dtype(dtype)
+    t, sigma = _cast(dtype, t, sigma)
+    t = numpy.maximum(t, 0.)
+    return _d1(S, K, t, r, sigma, dtype) - sigma * numpy.sqrt(t)
 
 
-def black_scholes(flag, S, K, t, r, sigma):
+@instrumented('black_scholes')
+def black_scholes(flag, S, K, t, r, sigma, dtype=None):
     """Return the Black-Scholes option price implemented in
         python (for reference).
 
@@ -88,10 +133,12 @@ def black_scholes(flag, S, K, t, r, sigma):
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
     :param flag: 'c' or 'p' for call or put.
     :type flag: str
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 15.6, page 338
 
@@ -111,16 +158,17 @@ def black_scholes(flag, S, K, t, r, sigma):
 
     """
 
-    e_to_the_minus_rt = numpy.exp(-r * t)
-    d1 = _d1(S, K, t, r, sigma)
-    d2 = _d2(S, K, t, r, sigma)
-    if flag == 'c':
-        return S * norm.cdf(d1) - K * e_to_the_minus_rt * norm.cdf(d2)
-    else:
-        return - S * norm.cdf(-d1) + K * e_to_the_minus_rt * norm.cdf(-d2)
+    dtype = _resolve_dtype(dtype)
+    S, K, t, sigma = _cast(dtype, S, K, t, sigma)
+    t = numpy.maximum(t, 0.)
+    r, e_to_the_minus_rt = _rate_and_discount(r, t, dtype)
 
+    d1 = _d1(S, K, t, r, sigma, dtype)
+    return _prices(flag, S, K, t, sigma, e_to_the_minus_rt, d1, dtype)[0]
 
-def delta(flag, S, K, t, r, sigma):
+
+@instrumented('delta')
+def delta(flag, S, K, t, r, sigma, dtype=None):
     """Return Black-Scholes delta of an option.
 
     :param S: underlying asset price
@@ -131,10 +179,12 @@ def delta(flag, S, K, t, r, sigma):
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
     :param flag: 'c' or 'p' for call or put.
     :type flag: str
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 19.1, page 405
 
@@ -156,15 +206,17 @@ def delta(flag, S, K, t, r, sigma):
     True
     """
 
-    d1 = _d1(S, K, t, r, sigma)
+    dtype = _resolve_dtype(dtype)
+    d1 = _d1(S, K, t, r, sigma, dtype)
 
     if flag == 'p':
-        return norm.cdf(d1) - 1.0
+        return -_cdf(-d1)
     else:
-        return norm.cdf(d1)
+        return _cdf(d1)
 
 
-def theta(flag, S, K, t, r, sigma):
+@instrumented('theta')
+def theta(flag, S, K, t, r, sigma, dtype=None):
     """Return Black-Scholes theta of an option.
 
     :param S: underlying asset price
@@ -175,10 +227,12 @@ def theta(flag, S, K, t, r, sigma):
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
     :param flag: 'c' or 'p' for call or put.
     :type flag: str
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 19.2, page 409
 
@@ -187,6 +241,8 @@ def theta(flag, S, K, t, r, sigma):
     maturity is 20 weeks (0.3846 years), and the volatility is 20%. In this case,
     S = 49, K = 50, r = 0.05, sigma = 0.2, and T = 0.3846
 
+    At expiry or with zero volatility only the interest term remains.
+
     The text book analytical formula does not divide by 365,
     but in practice theta is defined as the change in price
     for each day change in t, hence we divide by 365.
@@ -219,23 +275,29 @@ def theta(flag, S, K, t, r, sigma):
     True
     """
 
+    dtype = _resolve_dtype(dtype)
+    S, K, t, sigma = _cast(dtype, S, K, t, sigma)
+    t = numpy.maximum(t, 0.)
+    r, e_to_the_minus_rt = _rate_and_discount(r, t, dtype)
+
     two_sqrt_t = 2 * numpy.sqrt(t)
 
-    d1 = _d1(S, K, t, r, sigma)
-    d2 = _d2(S, K, t, r, sigma)
+    d1 = _d1(S, K, t, r, sigma, dtype)
+    d2 = d1 - sigma * numpy.sqrt(t)
 
-    first_term = (-S * norm.pdf(d1) * sigma) / two_sqrt_t
+    first_term = _divide(-S * _pdf(d1) * sigma, two_sqrt_t, 0.)
 
     if flag == 'c':
-        second_term = r * K * numpy.exp(-r * t) * norm.cdf(d2)
+        second_term = r * K * e_to_the_minus_rt * _cdf(d2)
         return (first_term - second_term) / 365.0
 
     if flag == 'p':
-        second_term = r * K * numpy.exp(-r * t) * norm.cdf(-d2)
+        second_term = r * K * e_to_the_minus_rt * _cdf(-d2)
         return (first_term + second_term) / 365.0
 
 
-def gamma(S, K, t, r, sigma):
+@instrumented('gamma')
+def gamma(S, K, t, r, sigma, dtype=None):
     """Return Black-Scholes gamma of an option.
 
     :param S: underlying asset price
@@ -246,8 +308,10 @@ def gamma(S, K, t, r, sigma):
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 19.4, page 414
 
@@ -256,6 +320,9 @@ def gamma(S, K, t, r, sigma):
     maturity is 20 weeks (0.3846 years), and the volatility is 20%. In this case,
     S = 49, K = 50, r = 0.05, sigma = 0.2, and T = 0.3846
 
+    At expiry or with zero volatility gamma is returned as 0, its limit
+    everywhere except exactly at the strike.
+
     S = 49
     K = 50
     r = .05
@@ -269,12 +336,17 @@ def gamma(S, K, t, r, sigma):
     True
     """
 
-    d_1 = _d1(S, K, t, r, sigma)
+    dtype = _resolve_dtype(dtype)
+    S, K, t, sigma = _cast(dtype, S, K, t, sigma)
+    t = numpy.maximum(t, 0.)
+
+    d_1 = _d1(S, K, t, r, sigma, dtype)
     # v_squared = sigma ** 2
-    return norm.pdf(d_1) / (S * sigma * numpy.sqrt(t))
+    return _divide(_pdf(d_1), S * sigma * numpy.sqrt(t), 0.)
 
 
-def vega(S, K, t, r, sigma):
+@instrumented('vega')
+def vega(S, K, t, r, sigma, dtype=None):
     """Return Black-Scholes vega of an option.
 
     :param S: underlying asset price
@@ -285,8 +357,10 @@ def vega(S, K, t, r, sigma):
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 19.4, page 414
 
@@ -313,11 +387,16 @@ def vega(S, K, t, r, sigma):
 
     """
 
-    d_1 = _d1(S, K, t, r, sigma)
-    return S * norm.pdf(d_1) * numpy.sqrt(t) * 0.01
+    dtype = _resolve_dtype(dtype)
+    S, K, t, sigma = _cast(dtype, S, K, t, sigma)
+    t = numpy.maximum(t, 0.)
 
+    d_1 = _d1(S, K, t, r, sigma, dtype)
+    return S * _pdf(d_1) * numpy.sqrt(t) * 0.01
 
-def rho(flag, S, K, t, r, sigma):
+
+@instrumented('rho')
+def rho(flag, S, K, t, r, sigma, dtype=None):
     """Return Black-Scholes rho of an option.
 
     :param S: underlying asset price
@@ -328,10 +407,12 @@ def rho(flag, S, K, t, r, sigma):
     :type sigma: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
     :param flag: 'c' or 'p' for call or put.
     :type flag: str
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     The text book analytical formula does not multiply by .01,
     but in practice rho is defined as the change in price
@@ -357,25 +438,32 @@ def rho(flag, S, K, t, r, sigma):
     True
     """
 
-    d2 = _d2(S, K, t, r, sigma)
-    e_to_the_minus_rt = numpy.exp(-r * t)
+    dtype = _resolve_dtype(dtype)
+    S, K, t, sigma = _cast(dtype, S, K, t, sigma)
+    t = numpy.maximum(t, 0.)
+    r, e_to_the_minus_rt = _rate_and_discount(r, t, dtype)
+
+    d2 = _d2(S, K, t, r, sigma, dtype)
     if flag == 'c':
-        return t * K * e_to_the_minus_rt * norm.cdf(d2) * .01
+        return t * K * e_to_the_minus_rt * _cdf(d2) * .01
     else:
-        return -t * K * e_to_the_minus_rt * norm.cdf(-d2) * .01
+        return -t * K * e_to_the_minus_rt * _cdf(-d2) * .01
 
 
-def futures(S, t, r, q):
+@instrumented('futures')
+def futures(S, t, r, q, dtype=None):
     """Calculate the forward price of an underlying asset.
 
     :param S: underlying asset price
     :type S: float
     :param t: time to expiration in years
     :type t: float
-    :param r: risk-free interest rate
-    :type r: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
     :param q: dividend yield percentage per annum
     :type q: float
+    :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+    :type dtype: numpy.dtype
 
     John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 5.5, page 116
 
@@ -396,4 +484,7 @@ def futures(S, t, r, q):
     True
     """
 
+    dtype = _resolve_dtype(dtype)
+    S, t, q = _cast(dtype, S, t, q)
+    r = _rate(r, t, dtype)
     return S * numpy.exp((r - q) * t)
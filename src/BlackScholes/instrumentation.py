@@ -0,0 +1,243 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy
+
+
+# Upper bounds of the latency histogram buckets in seconds, an implicit +Inf bucket follows.
+LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {}
+# raw helper -> its timed wrapper, for every instrumented_helper
+_timed_helpers = {}
+# top level package whose modules have their helper names rebound, e.g. 'src'
+_PACKAGE = __name__.rsplit('.', 2)[0]
+
+
+class _Stats(object):
+    """Running counters for a single instrumented function."""
+
+    __slots__ = ('calls', 'elements', 'seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.elements = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, elapsed, elements):
+        self.calls += 1
+        self.elements += elements
+        self.seconds += elapsed
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'elements': self.elements,
+            'seconds': self.seconds,
+            'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], self.buckets)),
+        }
+
+
+def _element_count(result):
+    """Number of priced elements in a result, the chain pricer returns a tuple of arrays."""
+
+    if isinstance(result, tuple):
+        result = result[0] if result else ()
+    return int(numpy.size(result))
+
+
+def _record(name, func, *args, **kwargs):
+    """Call ``func``, recording its wall time and element count under ``name``."""
+
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _Stats()
+        stats.record(elapsed, _element_count(result))
+    return result
+
+
+def instrumented(name):
+    """Decorate a public pricing function so its calls are recorded under ``name``.
+
+    While instrumentation is disabled the wrapper costs a single flag test
+    before delegating. Internal calls between pricing functions go through
+    ``instrumented_helper`` functions instead, so a call is wrapped once.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return _record(name, func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrumented_helper(name):
+    """Register a helper called from inside the package, e.g. ``_d1`` or the normal cdf.
+
+    The helper is returned unchanged, so its calls cost nothing extra while
+    instrumentation is disabled. Enabling rebinds the names this package's
+    own modules import it under to a timed wrapper, disabling binds the raw
+    helper back; modules outside the package are never touched.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            return _record(name, func, *args, **kwargs)
+        _timed_helpers[func] = timed
+        return timed if _enabled else func
+    return decorator
+
+
+def _package_modules():
+    for module_name, module in list(sys.modules.items()):
+        if module_name == _PACKAGE or module_name.startswith(_PACKAGE + '.'):
+            yield module
+
+
+def _rebind(enabled):
+    """Point the package's names for each helper at its timed wrapper, or back at the raw helper."""
+
+    if enabled:
+        replacements = {id(raw): (raw, timed) for raw, timed in _timed_helpers.items()}
+    else:
+        replacements = {id(timed): (timed, raw) for raw, timed in _timed_helpers.items()}
+    for module in _package_modules():
+        namespace = vars(module)
+        for attribute, value in list(namespace.items()):
+            replacement = replacements.get(id(value))
+            if replacement is not None and replacement[0] is value:
+                namespace[attribute] = replacement[1]
+
+
+def _set_enabled(enabled):
+    global _enabled
+    with _lock:
+        if enabled != _enabled:
+            _rebind(enabled)
+            _enabled = enabled
+
+
+def enable():
+    """Start recording calls to instrumented functions."""
+
+    _set_enabled(True)
+
+
+def disable():
+    """Stop recording, counters already collected are kept."""
+
+    _set_enabled(False)
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Discard every recorded counter."""
+
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    """Return a copy of the counters as ``{name: {calls, elements, seconds, buckets}}``.
+
+    Nested calls are recorded on their own, e.g. ``black_scholes`` also counts
+    the ``_d1`` and ``norm.cdf`` calls it makes, so the times are inclusive.
+    """
+
+    with _lock:
+        return {name: stats.as_dict() for name, stats in _stats.items()}
+
+
+@contextmanager
+def profiling(reset_counters=True):
+    """Enable instrumentation for the duration of a block.
+
+    with profiling() as stats:
+        option_chain(S, K, T, sigma, r)
+    stats['option_chain']['calls']
+
+    The yielded dict is filled with the snapshot when the block exits.
+    """
+
+    previous = _enabled
+    if reset_counters:
+        reset()
+    collected = {}
+    _set_enabled(True)
+    try:
+        yield collected
+    finally:
+        _set_enabled(previous)
+        collected.update(snapshot())
+
+
+def dump_json(path):
+    """Write the current snapshot to ``path`` as JSON."""
+
+    with open(path, 'w') as handle:
+        json.dump(snapshot(), handle, indent=2, sort_keys=True)
+
+
+def to_prometheus(prefix='blackscholes'):
+    """Render the current snapshot in the Prometheus text exposition format."""
+
+    lines = [
+        '# HELP %s_calls_total Number of calls per pricing function.' % prefix,
+        '# TYPE %s_calls_total counter' % prefix,
+    ]
+    data = snapshot()
+    for name in sorted(data):
+        lines.append('%s_calls_total{function="%s"} %d' % (prefix, name, data[name]['calls']))
+
+    lines.append('# HELP %s_elements_total Number of priced elements per pricing function.' % prefix)
+    lines.append('# TYPE %s_elements_total counter' % prefix)
+    for name in sorted(data):
+        lines.append('%s_elements_total{function="%s"} %d' % (prefix, name, data[name]['elements']))
+
+    lines.append('# HELP %s_latency_seconds Wall time per call.' % prefix)
+    lines.append('# TYPE %s_latency_seconds histogram' % prefix)
+    for name in sorted(data):
+        cumulative = 0
+        for bound, count in data[name]['buckets'].items():
+            cumulative += count
+            lines.append('%s_latency_seconds_bucket{function="%s",le="%s"} %d' % (prefix, name, bound, cumulative))
+        lines.append('%s_latency_seconds_sum{function="%s"} %r' % (prefix, name, data[name]['seconds']))
+        lines.append('%s_latency_seconds_count{function="%s"} %d' % (prefix, name, data[name]['calls']))
+    return '\n'.join(lines) + '\n'
+
+
+def dump_prometheus(path, prefix='blackscholes'):
+    """Write the current snapshot to ``path`` for a node-exporter style textfile collector.
+
+    The file is written next to its destination and renamed into place so a
+    scraper never reads a half written file.
+    """
+
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as handle:
+        handle.write(to_prometheus(prefix))
+    os.replace(temporary, path)
@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+
+import numpy
+from scipy.special import ndtr
+
+from .instrumentation import instrumented_helper
+
+
+FLOAT64 = numpy.float64
+FLOAT32 = numpy.float32
+
+_SUPPORTED_DTYPES = (FLOAT64, FLOAT32)
+# elements widened to float64 at a time when float32 prices are assembled
+_CHUNK_SIZE = 1 << 16
+_default_dtype = FLOAT64
+
+
+def get_dtype():
+    """Return the dtype currently used by the vectorized pricers.
+
+    float64 is the default; float32 halves the memory traffic of large
+    scenario grids at roughly 1e-5 relative accuracy on prices.
+    """
+
+    return _default_dtype
+
+
+def set_dtype(dtype):
+    """Set the dtype used by the vectorized pricers when no ``dtype`` is passed.
+
+    :param dtype: numpy.float64 or numpy.float32 (or their string names)
+    :type dtype: numpy.dtype
+    :returns: the previously active dtype
+    """
+
+    global _default_dtype
+    previous = _default_dtype
+    _default_dtype = _resolve_dtype(dtype)
+    return previous
+
+
+@contextmanager
+def precision(dtype):
+    """Temporarily switch the pricing dtype.
+
+    with precision(numpy.float32):
+        prices = black_scholes('c', S, K, t, r, sigma)
+    """
+
+    previous = set_dtype(dtype)
+    try:
+        yield get_dtype()
+    finally:
+        set_dtype(previous)
+
+
+def _resolve_dtype(dtype=None):
+    """Map ``None`` to the active policy and validate anything else."""
+
+    if dtype is None:
+        return _default_dtype
+    resolved = numpy.dtype(dtype).type
+    if resolved not in _SUPPORTED_DTYPES:
+        raise ValueError("dtype must be float64 or float32, got %s" % numpy.dtype(dtype).name)
+    return resolved
+
+
+def _cast(dtype, *values):
+    """Cast every input to ``dtype`` without copying when it already matches."""
+
+    return tuple(numpy.asarray(value, dtype=dtype) for value in values)
+
+
+def _log_moneyness(S, K, dtype):
+    """Return log(S / K) evaluated in float64 and delivered in ``dtype``.
+
+    Near the money S / K is close to 1 and its logarithm loses most of its
+    significant digits in single precision, so this step is always done in
+    double precision.
+    """
+
+    log_sk = numpy.log(numpy.asarray(S, dtype=FLOAT64) / numpy.asarray(K, dtype=FLOAT64))
+    return log_sk.astype(dtype, copy=False)
+
+
+def _assemble(flags, S, K, t, sigma, discount, d1):
+    """Prices for each flag in ``flags`` from float64 inputs."""
+
+    d2 = d1 - sigma * numpy.sqrt(t)
+    discounted_strike = K * discount
+    prices = []
+    for flag in flags:
+        if flag == 'c':
+            prices.append(S * _cdf(d1) - discounted_strike * _cdf(d2))
+        else:
+            prices.append(discounted_strike * _cdf(-d2) - S * _cdf(-d1))
+    return prices
+
+
+def _prices(flags, S, K, t, sigma, discount, d1, dtype):
+    """Return the Black-Scholes price for each flag in ``flags`` ('c', 'p' or 'cp'), delivered in ``dtype``.
+
+    S * N(d1) and K * discount * N(d2) are both of the order of S while an
+    out of the money price can be orders of magnitude smaller, so a float32
+    subtraction would cancel most of its significant digits. The prices are
+    therefore assembled in float64, with d2 derived from d1 in float64: the
+    price is then insensitive to the rounding of d1 to first order, since
+    S * N'(d1) = K * exp(-r t) * N'(d2). ``discount`` is exp(-r t), or the
+    discount factor of a RateCurve, so it is never exponentiated again here.
+
+    In float32 mode the inputs are widened _CHUNK_SIZE elements at a time and
+    the results narrowed into float32 outputs, so the float64 temporaries
+    never cover the whole batch.
+    """
+
+    operands = [S, K, t, sigma, discount, d1]
+    if dtype is FLOAT64 or numpy.broadcast(*operands).size <= _CHUNK_SIZE:
+        return [price.astype(dtype, copy=False) for price in _assemble(flags, *_cast(FLOAT64, *operands))]
+
+    iterator = numpy.nditer(operands + [None] * len(flags),
+                            flags=['external_loop', 'buffered', 'zerosize_ok'],
+                            op_flags=[['readonly']] * len(operands) + [['writeonly', 'allocate']] * len(flags),
+                            op_dtypes=[FLOAT64] * len(operands) + [dtype] * len(flags),
+                            casting='same_kind', buffersize=_CHUNK_SIZE)
+    with iterator:
+        for chunk in iterator:
+            for out, price in zip(chunk[len(operands):], _assemble(flags, *chunk[:len(operands)])):
+                out[...] = price
+        return iterator.operands[len(operands):]
+
+
+@instrumented_helper('norm.cdf')
+def _cdf(x):
+    """Standard normal cdf preserving the input dtype.
+
+    ``scipy.special.ndtr`` evaluates its float32 loop in double precision and
+    uses erfc in the tails, so small probabilities keep their relative
+    accuracy instead of underflowing through ``1 - cdf``.
+    """
+
+    return ndtr(x)
+
+
+@instrumented_helper('norm.pdf')
+def _pdf(x):
+    """Standard normal pdf preserving the input dtype."""
+
+    x = numpy.asarray(x)
+    return numpy.exp(-0.5 * x * x) / numpy.sqrt(2.0 * numpy.pi, dtype=x.dtype)
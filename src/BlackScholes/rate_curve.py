@@ -0,0 +1,171 @@
+import numpy
+
+
+class RateCurve(object):
+    """Zero coupon curve with interpolated, cached discount factors.
+
+    :param times: pillar maturities in years, strictly increasing and positive
+    :type times: list
+    :param rates: continuously compounded zero rates at the pillars
+    :type rates: list
+    :param interpolation: 'log-linear' interpolates log discount factors, i.e. piecewise
+        flat forward rates, 'linear' interpolates the discount factors themselves
+    :type interpolation: str
+
+    Before the first pillar the curve starts from a discount factor of 1 at
+    t = 0; beyond the last pillar the last forward rate is held flat.
+
+    A RateCurve is accepted wherever a flat rate r is, e.g.
+    black_scholes('c', S, K, t, curve, sigma). The zero rate to each expiry
+    enters d1 and the discount factor replaces exp(-r * t). Both are computed
+    once per distinct expiry and cached, so repricing every strike of an
+    expiry, in one call or in many, reuses them instead of exponentiating per
+    option.
+    """
+
+    INTERPOLATIONS = ('log-linear', 'linear')
+    # distinct expiries remembered before the cache is flushed, bounds memory when t drifts continuously
+    CACHE_SIZE = 4096
+
+    def __init__(self, times, rates, interpolation='log-linear'):
+        times = numpy.asarray(times, dtype=numpy.float64)
+        rates = numpy.asarray(rates, dtype=numpy.float64)
+        if times.ndim != 1 or times.shape != rates.shape or times.size == 0:
+            raise ValueError("times and rates must be non empty one dimensional arrays of the same length")
+        if times[0] <= 0 or numpy.any(numpy.diff(times) <= 0):
+            raise ValueError("times must be positive and strictly increasing")
+        if interpolation not in self.INTERPOLATIONS:
+            raise ValueError("interpolation must be one of %s, got %r"
+                             % (', '.join(self.INTERPOLATIONS), interpolation))
+
+        self.times = times
+        self.rates = rates
+        self.interpolation = interpolation
+        self._pillar_times = numpy.concatenate(([0.0], times))
+        self._pillar_discounts = numpy.concatenate(([1.0], numpy.exp(-rates * times)))
+        self._pillar_log_discounts = numpy.log(self._pillar_discounts)
+        self._tail_forward = ((self._pillar_log_discounts[-2] - self._pillar_log_discounts[-1])
+                              / (self._pillar_times[-1] - self._pillar_times[-2]))
+        # expiry -> (zero rate, discount factor)
+        self._cache = {}
+
+    @classmethod
+    def from_discount_factors(cls, times, discount_factors, interpolation='log-linear'):
+        """Build a curve from discount factors instead of zero rates."""
+
+        times = numpy.asarray(times, dtype=numpy.float64)
+        rates = -numpy.log(numpy.asarray(discount_factors, dtype=numpy.float64)) / times
+        return cls(times, rates, interpolation)
+
+    @classmethod
+    def flat(cls, r, horizon=30.0):
+        """A curve equivalent to the flat rate ``r``."""
+
+        return cls([horizon], [r])
+
+    def _interpolate(self, t):
+        """Discount factors at the distinct expiries ``t`` (a 1-d float64 array)."""
+
+        last = self._pillar_times[-1]
+        inside = numpy.minimum(t, last)
+        if self.interpolation == 'log-linear':
+            discounts = numpy.exp(numpy.interp(inside, self._pillar_times, self._pillar_log_discounts))
+        else:
+            discounts = numpy.interp(inside, self._pillar_times, self._pillar_discounts)
+        beyond = t > last
+        if numpy.any(beyond):
+            discounts[beyond] = self._pillar_discounts[-1] * numpy.exp(-self._tail_forward * (t[beyond] - last))
+        return discounts
+
+    def _evaluate(self, expiries):
+        """Zero rates and discount factors at the 1-d float64 array ``expiries``."""
+
+        discounts = self._interpolate(expiries)
+        return self._zero_rates(expiries, discounts), discounts
+
+    def _lookup(self, t):
+        """Return zero rates and discount factors shaped like ``t``, computed once per distinct expiry."""
+
+        t = numpy.asarray(t, dtype=numpy.float64)
+        cache = self._cache
+        if t.size == 1:
+            expiry = float(t.reshape(-1)[0])
+            entry = cache.get(expiry)
+            if entry is None:
+                if len(cache) >= self.CACHE_SIZE:
+                    cache.clear()
+                rates, discounts = self._evaluate(numpy.array([expiry]))
+                entry = cache[expiry] = (float(rates[0]), float(discounts[0]))
+            return numpy.full(t.shape, entry[0]), numpy.full(t.shape, entry[1])
+
+        # chains list each expiry's strikes together, so dedupe runs of equal expiries first, in O(n),
+        # and sort only the values of the runs
+        flat = t.ravel()
+        starts = numpy.flatnonzero(numpy.concatenate(([True], flat[1:] != flat[:-1])))
+        expiries, run_inverse = numpy.unique(flat[starts], return_inverse=True)
+        if expiries.size > self.CACHE_SIZE:
+            # too many distinct expiries to cache, evaluating them once each is all that can be saved
+            rates, discounts = self._evaluate(expiries)
+        else:
+            keys = expiries.tolist()
+            missing = [expiry for expiry in keys if expiry not in cache]
+            if missing:
+                if len(cache) + len(missing) > self.CACHE_SIZE:
+                    cache.clear()
+                    missing = keys
+                rates, discounts = self._evaluate(numpy.array(missing))
+                cache.update(zip(missing, zip(rates.tolist(), discounts.tolist())))
+            rates, discounts = numpy.array([cache[expiry] for expiry in keys]).T
+        lengths = numpy.diff(numpy.append(starts, flat.size))
+        return (numpy.repeat(rates[run_inverse], lengths).reshape(t.shape),
+                numpy.repeat(discounts[run_inverse], lengths).reshape(t.shape))
+
+    def _zero_rates(self, t, discounts=None):
+        # the zero rate of a zero maturity is taken as the first pillar rate
+        if discounts is None:
+            discounts = self._interpolate(t)
+        safe = numpy.where(t > 0, t, 1.0)
+        return numpy.where(t > 0, -numpy.log(discounts) / safe, self.rates[0])
+
+    def discount(self, t):
+        """Return the discount factor to each expiry in ``t``."""
+
+        return self._lookup(t)[1]
+
+    def zero_rate(self, t):
+        """Return the continuously compounded zero rate to each expiry in ``t``."""
+
+        return self._lookup(t)[0]
+
+    def forward_rate(self, t1, t2):
+        """Return the continuously compounded forward rate between ``t1`` and ``t2``."""
+
+        t1 = numpy.asarray(t1, dtype=numpy.float64)
+        t2 = numpy.asarray(t2, dtype=numpy.float64)
+        return numpy.log(self.discount(t1) / self.discount(t2)) / (t2 - t1)
+
+    def clear_cache(self):
+        """Forget every cached discount factor and zero rate."""
+
+        self._cache.clear()
+
+
+def _rate(r, t, dtype):
+    """Return the rate entering d1 in ``dtype``, the zero rate to t when r is a RateCurve."""
+
+    if isinstance(r, RateCurve):
+        return r.zero_rate(t).astype(dtype, copy=False)
+    return numpy.asarray(r, dtype=dtype)
+
+
+def _rate_and_discount(r, t, dtype):
+    """Return the rate entering d1 and the discount factor to t, both in ``dtype``.
+
+    ``t`` must already be cast to ``dtype``.
+    """
+
+    if isinstance(r, RateCurve):
+        rates, discounts = r._lookup(t)
+        return rates.astype(dtype, copy=False), discounts.astype(dtype, copy=False)
+    r = numpy.asarray(r, dtype=dtype)
+    return r, numpy.exp(-r * t)
@@ -0,0 +1,79 @@
+"""
+
+Cost of the masked handling of expired and zero volatility contracts.
+1M contracts are priced clean and with 0.1% of the rows expired or at
+zero volatility, against the unguarded closed form and against
+pre-filtering the degenerate rows in Python.
+
+python -m src.benchmarks.bench_degenerate
+
+"""
+import time
+import warnings
+
+import numpy
+from scipy.special import ndtr
+
+from src.BlackScholes import black_scholes
+
+
+def _unguarded(S, K, t, r, sigma):
+    sqrt_t = numpy.sqrt(t)
+    d1 = (numpy.log(S / K) + (r + sigma * sigma / 2.) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    return S * ndtr(d1) - K * numpy.exp(-r * t) * ndtr(d2)
+
+
+def _prefiltered(S, K, t, r, sigma):
+    price = numpy.maximum(S - K * numpy.exp(-r * t), 0.0)
+    live = (t > 0) & (sigma > 0)
+    price[live] = _unguarded(S[live], K[live], t[live], r, sigma[live])
+    return price
+
+
+def _best(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(size=1000000, degenerate_fraction=0.001):
+    rng = numpy.random.default_rng(0)
+    S = rng.uniform(50.0, 150.0, size)
+    K = rng.uniform(50.0, 150.0, size)
+    t = rng.uniform(0.01, 2.0, size)
+    sigma = rng.uniform(0.1, 0.6, size)
+    r = 0.05
+
+    dirty_t, dirty_sigma = t.copy(), sigma.copy()
+    rows = rng.choice(size, int(size * degenerate_fraction), replace=False)
+    dirty_t[rows[::2]] = 0.0
+    dirty_sigma[rows[1::2]] = 0.0
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        _unguarded(S, K, dirty_t, r, dirty_sigma)
+        unguarded_warnings = len(caught)
+        black_scholes('c', S, K, dirty_t, r, dirty_sigma)
+        guarded_warnings = len(caught) - unguarded_warnings
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return {
+            'clean, unguarded': _best(lambda: _unguarded(S, K, t, r, sigma)),
+            'clean, black_scholes': _best(lambda: black_scholes('c', S, K, t, r, sigma)),
+            'dirty, unguarded': _best(lambda: _unguarded(S, K, dirty_t, r, dirty_sigma)),
+            'dirty, pre-filtered': _best(lambda: _prefiltered(S, K, dirty_t, r, dirty_sigma)),
+            'dirty, black_scholes': _best(lambda: black_scholes('c', S, K, dirty_t, r, dirty_sigma)),
+        }, unguarded_warnings, guarded_warnings
+
+
+if __name__ == '__main__':
+
+    timings, unguarded_warnings, guarded_warnings = benchmark()
+    for name, seconds in timings.items():
+        print("%-22s %8.4f s" % (name, seconds))
+    print("RuntimeWarnings on the dirty batch: unguarded %d, black_scholes %d" % (unguarded_warnings, guarded_warnings))
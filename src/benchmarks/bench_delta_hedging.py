@@ -0,0 +1,65 @@
+"""
+
+Delta hedging 100k paths x 252 rebalances: one vectorized delta call per
+rebalance date, serially, in chunks and over a process pool, against the
+doubly nested Python loop over paths and dates (timed on a subset and
+scaled up).
+
+python -m src.benchmarks.bench_delta_hedging [paths]
+
+"""
+import os
+import sys
+import time
+
+import numpy
+
+from src.BlackScholes import black_scholes, delta
+from src.stock_simulation import delta_hedge, gbm_paths
+
+
+S, K, t, r, sigma, rebalances = 100.0, 100.0, 1.0, 0.05, 0.2, 252
+
+
+def _nested_loop(paths):
+    prices = gbm_paths(S, r, sigma, t, rebalances, paths, seed=0)
+    dt = t / rebalances
+    pnl = numpy.empty(paths)
+    for i in range(paths):
+        shares = delta('c', S, K, t, r, sigma)
+        cash = black_scholes('c', S, K, t, r, sigma) - shares * S
+        for step in range(1, rebalances):
+            cash *= numpy.exp(r * dt)
+            new_shares = delta('c', prices[i, step], K, t - step * dt, r, sigma)
+            cash -= (new_shares - shares) * prices[i, step]
+            shares = new_shares
+        cash *= numpy.exp(r * dt)
+        pnl[i] = cash + shares * prices[i, -1] - max(prices[i, -1] - K, 0.0)
+    return pnl
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    premium = black_scholes('c', S, K, t, r, sigma)
+    workers = min(4, os.cpu_count() or 1)
+
+    runs = (
+        ('vectorized', dict()),
+        ('chunks of 25k', dict(chunk_size=25000)),
+        ('%d processes' % workers, dict(chunk_size=max(1, paths // workers), processes=workers)),
+    )
+    for name, options in runs:
+        (pnl, _), seconds = _timed(lambda: delta_hedge('c', S, K, t, r, sigma, rebalances=rebalances,
+                                                       paths=paths, seed=0, **options))
+        print("%-16s %8.2f s  replication error std / premium %.4f" % (name, seconds, pnl.std() / premium))
+
+    subset = 50
+    _, seconds = _timed(lambda: _nested_loop(subset))
+    print("%-16s %8.2f s  (%d paths timed, scaled to %d)" % ('nested loop', seconds * paths / subset, subset, paths))
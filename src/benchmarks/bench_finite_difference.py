@@ -0,0 +1,42 @@
+"""
+
+Accuracy and run time of the Crank-Nicolson solver against grid size, for a
+strip of strikes solved on one shared grid versus one grid per strike.
+
+python -m src.benchmarks.bench_finite_difference
+
+"""
+import time
+
+import numpy
+
+from src.BlackScholes import black_scholes, crank_nicolson
+
+
+S, t, r, sigma = 100.0, 1.0, 0.05, 0.25
+STRIKES = numpy.linspace(60.0, 140.0, 81)
+
+
+def benchmark(grids=((100, 50), (200, 100), (400, 200), (800, 400), (1600, 800))):
+    expected = black_scholes('c', S, STRIKES, t, r, sigma)
+    rows = []
+    for s_steps, t_steps in grids:
+        start = time.perf_counter()
+        price, _, _ = crank_nicolson('c', S, STRIKES, t, r, sigma, s_steps=s_steps, t_steps=t_steps)
+        shared = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for strike in STRIKES:
+            crank_nicolson('c', S, strike, t, r, sigma, s_steps=s_steps, t_steps=t_steps)
+        separate = time.perf_counter() - start
+
+        rows.append((s_steps, t_steps, float(numpy.abs(price - expected).max()), shared, separate))
+    return rows
+
+
+if __name__ == '__main__':
+
+    print("%d strikes" % STRIKES.size)
+    for s_steps, t_steps, error, shared, separate in benchmark():
+        print("S steps %5d  t steps %4d  max error %.2e  shared grid %7.3f s  per strike %7.3f s"
+              % (s_steps, t_steps, error, shared, separate))
@@ -0,0 +1,43 @@
+"""
+
+Carr-Madan FFT against black_scholes under GBM: accuracy on the
+simulate_options_chain strikes and time to price a dense strike grid.
+
+python -m src.benchmarks.bench_fourier
+
+"""
+import time
+
+import numpy
+
+from src.BlackScholes import black_scholes, carr_madan, fft_price
+from src.option_chain import simulate_options_chain
+
+
+S, r, sigma, T = 100.0, 0.05, 0.30, 30
+
+
+def _best(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+
+    t = T / 365
+    chain = simulate_options_chain(T, S=S, sigma=sigma, r=r, strikes=20)
+    K = chain.index.to_numpy()
+    error = numpy.abs(fft_price('c', S, K, t, r, sigma=sigma) - chain['call'].to_numpy()).max()
+    print("chain of %d strikes, max abs error vs black_scholes %.2e" % (K.size, error))
+
+    for n in (1024, 4096, 16384):
+        strikes, _ = carr_madan(S, t, r, n=n, eta=1024.0 / n, sigma=sigma)
+        fft_seconds = _best(lambda: carr_madan(S, t, r, n=n, eta=1024.0 / n, sigma=sigma))
+        vector_seconds = _best(lambda: black_scholes('c', S, strikes, t, r, sigma))
+        loop_seconds = _best(lambda: [black_scholes('c', S, k, t, r, sigma) for k in strikes], repeat=1)
+        print("%6d strikes  fft %8.5f s  black_scholes vectorized %8.5f s  one call per strike %8.4f s"
+              % (n, fft_seconds, vector_seconds, loop_seconds))
@@ -0,0 +1,51 @@
+"""
+
+Overhead of the instrumentation wrapper, disabled and enabled, on scalar
+black_scholes calls where it is proportionally largest, followed by the time
+enable() takes to rebind the package's helpers and a breakdown of where a
+chain pricing run spends its time.
+
+python -m src.benchmarks.bench_instrumentation
+
+"""
+import time
+
+import numpy
+
+from src.BlackScholes import black_scholes, profiling, enable, disable
+from src.option_chain import option_chain
+
+
+def _time_scalar_calls(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func('c', 42.0, 40.0, 0.5, 0.10, 0.2)
+    return (time.perf_counter() - start) / calls
+
+
+def benchmark(calls=20000):
+    results = {
+        'unwrapped': _time_scalar_calls(black_scholes.__wrapped__, calls),
+        'disabled': _time_scalar_calls(black_scholes, calls),
+    }
+    with profiling():
+        results['enabled'] = _time_scalar_calls(black_scholes, calls)
+
+    start = time.perf_counter()
+    enable()
+    results['enable()'] = time.perf_counter() - start
+    disable()
+    return results
+
+
+if __name__ == '__main__':
+
+    for name, seconds in benchmark().items():
+        print("%-10s %8.2f us" % (name, seconds * 1e6))
+
+    S = numpy.random.default_rng(0).uniform(10.0, 500.0, 1000000)
+    with profiling() as stats:
+        option_chain(S, S * 1.05, 30, 0.3, 0.05)
+    print()
+    for name, row in sorted(stats.items(), key=lambda item: -item[1]['seconds']):
+        print("%-14s calls %4d  elements %10d  %8.4f s" % (name, row['calls'], row['elements'], row['seconds']))
@@ -0,0 +1,62 @@
+"""
+
+Peak memory and throughput of the streaming accumulators against pricing
+the same Asian, barrier and lookback options from the full paths x steps
+matrix.
+
+python -m src.benchmarks.bench_path_dependent [paths]
+
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy
+
+from src.stock_simulation import gbm_paths
+from src.stock_simulation.path_dependent import simulate, RunningAverage, RunningMinimum, BarrierMonitor
+
+
+S, K, H, t, r, sigma, steps = 100.0, 100.0, 130.0, 1.0, 0.05, 0.3, 252
+
+
+def _full_matrix(paths):
+    prices = gbm_paths(S, r, sigma, t, steps, paths, seed=0)
+    discount = numpy.exp(-r * t)
+    asian = discount * numpy.maximum(prices[:, 1:].mean(axis=1) - K, 0.0).mean()
+    knocked = (prices[:, 1:] >= H).any(axis=1)
+    barrier = discount * numpy.where(knocked, 0.0, numpy.maximum(prices[:, -1] - K, 0.0)).mean()
+    lookback = discount * (prices[:, -1] - prices.min(axis=1)).mean()
+    return asian, barrier, lookback
+
+
+def _streaming(paths):
+    average = RunningAverage(paths)
+    minimum = RunningMinimum(paths, S)
+    monitor = BarrierMonitor(paths, H, 'up')
+    terminal = simulate(S, r, sigma, t, steps, paths, [average, minimum, monitor], seed=0)
+    discount = numpy.exp(-r * t)
+    asian = discount * numpy.maximum(average.value - K, 0.0).mean()
+    barrier = discount * numpy.where(monitor.value, 0.0, numpy.maximum(terminal - K, 0.0)).mean()
+    lookback = discount * (terminal - minimum.value).mean()
+    return asian, barrier, lookback
+
+
+def _measure(func, paths):
+    tracemalloc.start()
+    start = time.perf_counter()
+    prices = func(paths)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return prices, elapsed, peak
+
+
+if __name__ == '__main__':
+
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    for name, func in (('full matrix', _full_matrix), ('streaming', _streaming)):
+        prices, elapsed, peak = _measure(func, paths)
+        print("%-12s asian %7.4f  barrier %7.4f  lookback %7.4f  %7.2f s  %10.0f path-steps/s  peak %8.1f MB"
+              % ((name,) + tuple(prices) + (elapsed, paths * steps / elapsed, peak / 1e6)))
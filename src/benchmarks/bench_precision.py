@@ -0,0 +1,74 @@
+"""
+
+Throughput, memory and accuracy of the float32 pricing mode against float64,
+for black_scholes and for the full option_chain.
+
+python -m src.benchmarks.bench_precision
+
+"""
+import time
+import tracemalloc
+
+import numpy
+
+from src.BlackScholes import FLOAT32, FLOAT64, black_scholes
+from src.option_chain import option_chain, accuracy_report
+
+
+def _random_chain(size, seed=0):
+    rng = numpy.random.default_rng(seed)
+    S = rng.uniform(10.0, 500.0, size)
+    K = S * numpy.exp(rng.uniform(-0.5, 0.5, size))
+    T = rng.uniform(1.0, 730.0, size)
+    sigma = rng.uniform(0.05, 1.0, size)
+    r = rng.uniform(0.0, 0.10, size)
+    return S, K, T, sigma, r
+
+
+def _black_scholes(S, K, T, sigma, r, dtype):
+    return black_scholes('c', S, K, T / 365, r, sigma, dtype=dtype)
+
+
+PRICERS = {'black_scholes': _black_scholes, 'option_chain': option_chain}
+
+
+def benchmark(size=2000000, repeat=3):
+    """Time each pricer and trace its peak allocation for both dtypes."""
+
+    results = {}
+    for pricer_name, pricer in PRICERS.items():
+        for dtype in (FLOAT64, FLOAT32):
+            S, K, T, sigma, r = (x.astype(dtype) for x in _random_chain(size))
+
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                pricer(S, K, T, sigma, r, dtype=dtype)
+                best = min(best, time.perf_counter() - start)
+
+            tracemalloc.start()
+            outputs = pricer(S, K, T, sigma, r, dtype=dtype)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            outputs = outputs if isinstance(outputs, tuple) else (outputs,)
+            results[(pricer_name, numpy.dtype(dtype).name)] = {
+                'seconds': best,
+                'contracts_per_second': size / best,
+                'peak_bytes': peak,
+                'output_bytes': sum(x.nbytes for x in outputs),
+            }
+    return results
+
+
+if __name__ == '__main__':
+
+    for (pricer_name, name), row in benchmark().items():
+        print("%-14s %-8s %8.3f s  %12.0f contracts/s  peak %8.1f MB  outputs %8.1f MB"
+              % (pricer_name, name, row['seconds'], row['contracts_per_second'],
+                 row['peak_bytes'] / 1e6, row['output_bytes'] / 1e6))
+
+    print()
+    for name, row in accuracy_report().items():
+        print("%-10s max abs %.2e  max rel %.2e  p99 rel %.2e"
+              % (name, row['max_abs_error'], row['max_rel_error'], row['p99_rel_error']))
@@ -0,0 +1,68 @@
+"""
+
+Pricing a chain of many expiries x many strikes with a RateCurve, either
+one option_chain call per expiry or a single call over the whole chain, in
+both cases with the discount factor of each expiry computed once, against a
+flat rate array that is exponentiated per option.
+
+python -m src.benchmarks.bench_rate_curve
+
+"""
+import time
+
+import numpy
+
+from src.BlackScholes import RateCurve
+from src.option_chain import option_chain
+
+
+def benchmark(expiries=36, strikes=5000, repeat=5):
+    curve = RateCurve([0.25, 0.5, 1.0, 2.0, 3.0], [0.030, 0.033, 0.036, 0.038, 0.040])
+    days = numpy.linspace(7.0, 1095.0, expiries)
+    K = numpy.linspace(50.0, 150.0, strikes)
+    rates = curve.zero_rate(days / 365)
+
+    def per_option():
+        for T, r in zip(days, rates):
+            option_chain(100.0, K, T, 0.25, numpy.full(strikes, r))
+
+    def per_expiry():
+        for T in days:
+            option_chain(100.0, K, T, 0.25, curve)
+
+    chain_T = numpy.repeat(days, strikes)
+    chain_K = numpy.tile(K, expiries)
+    chain_r = numpy.repeat(rates, strikes)
+
+    def flat_single_call():
+        option_chain(100.0, chain_K, chain_T, 0.25, chain_r)
+
+    def curve_single_call():
+        option_chain(100.0, chain_K, chain_T, 0.25, curve)
+
+    # the rate inputs alone, which is all the curve changes
+    chain_t = chain_T / 365
+
+    def exp_per_option():
+        numpy.exp(-chain_r * chain_t)
+
+    def curve_lookup():
+        curve.discount(chain_t)
+
+    results = {}
+    for name, func in (('flat rate per option', per_option), ('curve per expiry', per_expiry),
+                       ('flat rate, one call', flat_single_call), ('curve, one call', curve_single_call),
+                       ('exp(-r t) per option', exp_per_option), ('curve discount lookup', curve_lookup)):
+        curve.clear_cache()
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        results[name] = (time.perf_counter() - start) / repeat
+    return results
+
+
+if __name__ == '__main__':
+
+    for name, seconds in benchmark().items():
+        print("%-22s %8.4f s per chain" % (name, seconds))
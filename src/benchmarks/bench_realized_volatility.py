@@ -0,0 +1,59 @@
+"""
+
+Rolling close-to-close volatility for 10 years x 5000 tickers: the batch
+function and the O(1) streaming estimator against pandas rolling, and the
+cost of one new bar when pandas recomputes the window over the full history.
+
+python -m src.benchmarks.bench_realized_volatility [bars] [tickers]
+
+"""
+import sys
+import time
+
+import numpy
+import pandas
+
+from src.stock_simulation import CloseToClose, close_to_close_volatility
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def benchmark(bars=2520, tickers=5000, window=21):
+    rng = numpy.random.default_rng(0)
+    close = 100.0 * numpy.exp(numpy.cumsum(rng.normal(0.0, 0.02, (bars, tickers)), axis=0))
+    frame = pandas.DataFrame(close)
+
+    expected, pandas_seconds = _timed(
+        lambda: (numpy.log(frame).diff().rolling(window).std() * numpy.sqrt(252)).to_numpy())
+    batch, batch_seconds = _timed(lambda: close_to_close_volatility(close, window))
+
+    estimator = CloseToClose(window, tickers=tickers)
+
+    def stream():
+        for row in close[:-1]:
+            estimator.update(row)
+    _, stream_seconds = _timed(stream)
+    last, update_seconds = _timed(lambda: estimator.update(close[-1]))
+    _, recompute_seconds = _timed(
+        lambda: (numpy.log(frame).diff().rolling(window).std() * numpy.sqrt(252)).iloc[-1])
+
+    return {
+        'pandas rolling, full history': pandas_seconds,
+        'batch, full history': batch_seconds,
+        'streaming, full history': stream_seconds + update_seconds,
+        'streaming, one new bar': update_seconds,
+        'pandas recompute, one new bar': recompute_seconds,
+        'max abs difference vs pandas': max(numpy.nanmax(numpy.abs(batch - expected)),
+                                            numpy.nanmax(numpy.abs(last - expected[-1]))),
+    }
+
+
+if __name__ == '__main__':
+
+    arguments = [int(value) for value in sys.argv[1:3]]
+    for name, value in benchmark(*arguments).items():
+        print("%-32s %.3e" % (name, value))
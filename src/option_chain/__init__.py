@@ -1 +1,3 @@
 from .option_chain import option_chain
+from .create_options_chain import simulate_options_chain
+from .accuracy import accuracy_report
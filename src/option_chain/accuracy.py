@@ -0,0 +1,45 @@
+import numpy
+
+from ..BlackScholes.precision import FLOAT32, FLOAT64
+from .option_chain import option_chain, OUTPUT_NAMES
+
+
+def accuracy_report(size=100000, seed=0):
+    """Compare float32 option chain outputs against the float64 reference.
+
+    Random contracts are drawn over a realistic range of moneyness, expiries,
+    volatilities and rates and priced with ``option_chain`` in both
+    precisions. The inputs are drawn in float64, so the errors include
+    their rounding to float32.
+
+    :param size: number of random contracts
+    :type size: int
+    :param seed: seed for the random generator
+    :type seed: int
+    :returns: dict mapping each output name to its max absolute error and its
+        max and 99th percentile relative error (relative error only where the
+        reference exceeds 1e-8; its maximum is large near zero crossings of
+        d1, d2 and theta by construction)
+    """
+
+    rng = numpy.random.default_rng(seed)
+    S = rng.uniform(10.0, 500.0, size)
+    K = S * numpy.exp(rng.uniform(-0.5, 0.5, size))
+    T = rng.uniform(1.0, 730.0, size)
+    sigma = rng.uniform(0.05, 1.0, size)
+    r = rng.uniform(0.0, 0.10, size)
+
+    reference = option_chain(S, K, T, sigma, r, dtype=FLOAT64)
+    reduced = option_chain(S, K, T, sigma, r, dtype=FLOAT32)
+
+    report = {}
+    for name, exact, approx in zip(OUTPUT_NAMES, reference, reduced):
+        error = numpy.abs(approx.astype(FLOAT64) - exact)
+        significant = numpy.abs(exact) > 1e-8
+        relative = error[significant] / numpy.abs(exact[significant])
+        report[name] = {
+            'max_abs_error': float(error.max()),
+            'max_rel_error': float(relative.max()) if relative.size else 0.0,
+            'p99_rel_error': float(numpy.percentile(relative, 99)) if relative.size else 0.0,
+        }
+    return report
@@ -1,18 +1,53 @@
-def simulate_options_chain(time_to_expiry, ):
+import numpy
+import pandas
+
+from .option_chain import option_chain, OUTPUT_NAMES
+
+
+def strike_increment(S):
+    """Return the spacing between listed strikes for an underlying trading at S.
 
-    """
     Options Chain Range Descriptor
     0.00 to 200.00      :   +/- 5.00 increments
     200.00 to 500.00    :   +/- 10.00 increments
     500.00 to 1,000.00   :   +/- 25.00 increments
     1,000.00 to 10,000.00  :   +/- 50.00 Increments
+    """
+
+    if S < 200.0:
+        return 5.0
+    if S < 500.0:
+        return 10.0
+    if S < 1000.0:
+        return 25.0
+    return 50.0
+
+
+def simulate_options_chain(time_to_expiry, S=100.00, sigma=0.50, r=0.05, strikes=10, dtype=None):
+    """Simulate the options chain of one expiry, strikes listed around the money.
 
     time to expiry
-    type of Options Chain : Example Daily, Weekly, Monthly or Quarterly
+    type of Options Chain : Example Daily, Weekly, Monthly or Quarterly, i.e. 1, 7, 30 or 91 days
 
-    :param : time_to_expiry :
-    :return:
-    :param
-    :returns
+    :param time_to_expiry: time to expiration in days
+    :type time_to_expiry: float
+    :param S: Underlying Asset / Stock Price
+    :type S: float
+    :param sigma: Annualized Standard Deviation, or Volatility
+    :type sigma: float
+    :param r: risk-free interest rate, or a RateCurve
+    :type r: float or RateCurve
+    :param strikes: number of strikes listed on each side of the at the money strike
+    :type strikes: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+    :returns: pandas.DataFrame indexed by strike with one column per option_chain output
     """
-    pass
+
+    increment = strike_increment(S)
+    at_the_money = round(S / increment) * increment
+    K = at_the_money + increment * numpy.arange(-strikes, strikes + 1)
+    K = K[K > 0]
+
+    outputs = option_chain(S, K, time_to_expiry, sigma, r, dtype=dtype)
+    return pandas.DataFrame(dict(zip(OUTPUT_NAMES, outputs)), index=pandas.Index(K, name='strike'))
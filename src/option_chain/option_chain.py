@@ -1,9 +1,18 @@
-from scipy.stats import norm
 import numpy
 
+from ..BlackScholes.greeks import _divide, _moneyness_limit
+from ..BlackScholes.instrumentation import instrumented
+from ..BlackScholes.precision import _resolve_dtype, _cast, _log_moneyness, _cdf, _pdf, _prices
+from ..BlackScholes.rate_curve import _rate_and_discount
+
+
+OUTPUT_NAMES = ('d1', 'd2', 'call', 'put', 'put_delta', 'call_delta', 'call_theta', 'put_theta',
+                'gamma', 'vega', 'call_rho', 'put_rho')
+
 
 # noinspection PyShadowingNames
-def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05):
+@instrumented('option_chain')
+def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05, dtype=None):
     """Calculate the d1 component of the Black-Scholes PDE.
 
         :param S: Underlying Asset / Stock Price
@@ -14,8 +23,15 @@ def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05):
         :type T: float
         :param sigma: Annualized Standard Deviation, or Volatility i.e. 50% is 0.50, or 30% is 0.30
         :type sigma: float
-        :param r: risk-free interest rate
-        :type r: float
+        :param r: risk-free interest rate, or a RateCurve
+        :type r: float or RateCurve
+        :param dtype: numpy.float64 (default) or numpy.float32, None uses the active precision policy
+        :type dtype: numpy.dtype
+
+        Every input may be a scalar or a numpy array; all outputs share ``dtype``.
+        log(S / K) is always evaluated in float64 before being narrowed.
+        Expired (T <= 0) and zero volatility rows return intrinsic value and
+        the limiting Greeks, with gamma and the decay part of theta set to 0.
 
         John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Example 15.6, page 338
 
@@ -33,9 +49,13 @@ def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05):
         abs(calculated_d1 - text_book_d1) < 0.0001
         True
         """
-    t = T / 365  # Converting the number of Days to Years
+    dtype = _resolve_dtype(dtype)
+    S, K, T, sigma = _cast(dtype, S, K, T, sigma)
+
+    t = numpy.maximum(T, 0.) / 365  # Converting the number of Days to Years
+    r, e_to_the_minus_rt = _rate_and_discount(r, t, dtype)
 
-    d1 = (numpy.log(S / K) + (r + (sigma ** 2) / 2) * t) / (sigma * numpy.sqrt(t))
+    d1 = _divide(_log_moneyness(S, K, dtype) + (r + (sigma ** 2) / 2) * t, sigma * numpy.sqrt(t), _moneyness_limit)
     """
         calculated_d1 = _d1(S,K,t,r,sigma)
         text_book_d1 = 0.7693
@@ -49,7 +69,7 @@ def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05):
     abs(calculated_d2 - text_book_d2) < 0.0001
     """
 
-    call = S * norm.cdf(d1, 0, 1) - K * numpy.exp(-r * t) * norm.cdf(d2, 0, 1)
+    call, put = _prices('cp', S, K, t, sigma, e_to_the_minus_rt, d1, dtype)
 
     """
     calculated_call = black_scholes('c', S, K, t, r, sigma)
@@ -57,8 +77,6 @@ def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05):
     abs(calculated_call - text_book_call) < 0.01
     """
 
-    put = - S * norm.cdf(-d1, 0, 1) + K * numpy.exp(-r * t) * norm.cdf(-d2, 0, 1)
-
     """
     calculated_put = black_scholes('p', S, K, t, r, sigma)
     text_book_put = 0.81
@@ -66,29 +84,28 @@ def option_chain(S=100.00, K=120.00, T=7, sigma=0.50, r=0.05):
     """
 
     # Delta Computation
-    put_delta = norm.cdf(d1) - 1.0
-    call_delta = norm.cdf(d1)
+    put_delta = -_cdf(-d1)
+    call_delta = _cdf(d1)
 
     two_sqrt_t = 2 * numpy.sqrt(t)
-    first_term = (-S * norm.pdf(d1) * sigma) / two_sqrt_t
+    first_term = _divide(-S * _pdf(d1) * sigma, two_sqrt_t, 0.)
 
     # Theta Computation
-    call_second_term = r * K * numpy.exp(-r * t) * norm.cdf(d2)
+    call_second_term = r * K * e_to_the_minus_rt * _cdf(d2)
     call_theta = (first_term - call_second_term) / 365.0
 
-    put_second_term = r * K * numpy.exp(-r * t) * norm.cdf(-d2)
+    put_second_term = r * K * e_to_the_minus_rt * _cdf(-d2)
     put_theta = (first_term + put_second_term) / 365.0
 
     # Gamma Computation
-    gamma = norm.pdf(d1) / (S * sigma * numpy.sqrt(t))
+    gamma = _divide(_pdf(d1), S * sigma * numpy.sqrt(t), 0.)
 
     # Vega Computation
-    vega = S * norm.pdf(d1) * numpy.sqrt(t) * 0.01
+    vega = S * _pdf(d1) * numpy.sqrt(t) * 0.01
 
     # Rho Computation
-    e_to_the_minus_rt = numpy.exp(-r * t)
-    call_rho = t * K * e_to_the_minus_rt * norm.cdf(d2) * .01
-    put_rho = -t * K * e_to_the_minus_rt * norm.cdf(-d2) * .01
+    call_rho = t * K * e_to_the_minus_rt * _cdf(d2) * .01
+    put_rho = -t * K * e_to_the_minus_rt * _cdf(-d2) * .01
 
     return d1, d2, call, put, put_delta, call_delta, call_theta, put_theta, gamma, vega, call_rho, put_rho
 
@@ -0,0 +1,14 @@
+from .stock_simulation import gbm_paths
+from .stock_simulation import gbm_steps
+from .path_dependent import asian_option
+from .path_dependent import barrier_option
+from .path_dependent import lookback_option
+from .realized_volatility import CloseToClose
+from .realized_volatility import Parkinson
+from .realized_volatility import GarmanKlass
+from .realized_volatility import EWMA
+from .realized_volatility import close_to_close_volatility
+from .realized_volatility import parkinson_volatility
+from .realized_volatility import garman_klass_volatility
+from .realized_volatility import ewma_volatility
+from .delta_hedging import delta_hedge
@@ -0,0 +1,129 @@
+"""
+
+Delta hedging backtest on simulated GBM paths.
+
+A writer sells one option at its Black-Scholes price and holds delta shares,
+rebalanced on equally spaced dates and financed at the risk-free rate. At
+every rebalance date the deltas of all paths come from one vectorized call
+to BlackScholes.delta, and cash, shares and transaction costs are updated in
+place, so memory stays O(paths). The hedger's P&L at expiry is the
+replication error of the strategy.
+
+John C. Hull, "Options, Futures and Other Derivatives," 9th edition, Table 19.7, page 409
+reports the ratio of the standard deviation of the hedging cost to the option
+price for the 20 week call of Example 19.1 (S = 49, K = 50, r = 0.05,
+sigma = 0.20, mu = 0.13): 0.19 when rebalancing weekly.
+
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from ..BlackScholes import black_scholes, delta
+from ..BlackScholes.precision import _resolve_dtype
+from .stock_simulation import gbm_steps
+
+
+def _hedge_chunk(flag, S, K, t, r, sigma, mu, hedge_sigma, rebalances, paths, transaction_cost, seed, dtype):
+    """Hedge ``paths`` paths and return their P&L and transaction costs."""
+
+    dt = t / float(rebalances)
+    growth = numpy.exp(r * dt)
+
+    premium = black_scholes(flag, S, K, t, r, hedge_sigma, dtype=dtype)
+    shares = numpy.full(paths, delta(flag, S, K, t, r, hedge_sigma, dtype=dtype), dtype=dtype)
+    costs = transaction_cost * numpy.abs(shares) * S
+    cash = premium - shares * S - costs
+
+    trade = numpy.empty(paths, dtype=dtype)
+    fee = numpy.empty(paths, dtype=dtype)
+    prices = None
+    for step, prices in enumerate(gbm_steps(S, mu, sigma, t, rebalances, paths, seed=seed, dtype=dtype), start=1):
+        cash *= growth
+        if step == rebalances:
+            break
+        new_shares = delta(flag, prices, K, t - step * dt, r, hedge_sigma, dtype=dtype)
+        numpy.subtract(new_shares, shares, out=trade)
+        trade *= prices
+        cash -= trade
+        if transaction_cost:
+            numpy.abs(trade, out=fee)
+            fee *= transaction_cost
+            cash -= fee
+            costs += fee
+        shares = new_shares
+
+    if flag == 'c':
+        payoff = numpy.maximum(prices - K, 0.0)
+    else:
+        payoff = numpy.maximum(K - prices, 0.0)
+    cash += shares * prices
+    cash -= payoff
+    return cash, costs
+
+
+def delta_hedge(flag, S, K, t, r, sigma, mu=None, hedge_sigma=None, rebalances=252, paths=10000,
+                transaction_cost=0.0, chunk_size=None, processes=None, seed=None, dtype=None):
+    """Simulate writing an option and delta hedging it, return the hedger's P&L per path.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate, used for financing and for the hedge deltas
+    :type r: float
+    :param sigma: volatility of the simulated paths
+    :type sigma: float
+    :param mu: drift of the simulated paths, defaults to r
+    :type mu: float
+    :param hedge_sigma: volatility used for the premium and the deltas, defaults to sigma
+    :type hedge_sigma: float
+    :param rebalances: number of equally spaced rebalance dates, the last one being expiry
+    :type rebalances: int
+    :param paths: number of simulated paths
+    :type paths: int
+    :param transaction_cost: proportional cost charged on the value of every share traded
+    :type transaction_cost: float
+    :param chunk_size: paths simulated together, bounds memory for very large runs
+    :type chunk_size: int
+    :param processes: when set, chunks are spread over a process pool of this size
+    :type processes: int
+    :param seed: seed of the numpy.random.SeedSequence the chunk streams are spawned from
+    :type seed: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+    :returns: P&L at expiry and cumulative transaction costs, one entry per path
+
+    A perfect hedge has zero P&L; its spread measures the replication error
+    of discrete rebalancing. Results depend on the seed and on chunk_size,
+    but not on the number of processes.
+
+    Hull Table 19.7, weekly rebalancing:
+    pnl, costs = delta_hedge('c', 49, 50, 20 / 52., 0.05, 0.2, mu=0.13, rebalances=20, paths=50000, seed=0)
+    pnl.std() / black_scholes('c', 49, 50, 20 / 52., 0.05, 0.2)
+    # about 0.19
+    """
+
+    dtype = _resolve_dtype(dtype)
+    mu = r if mu is None else mu
+    hedge_sigma = sigma if hedge_sigma is None else hedge_sigma
+    chunk_size = paths if chunk_size is None else chunk_size
+
+    sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+    seeds = numpy.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(flag, S, K, t, r, sigma, mu, hedge_sigma, rebalances, size, transaction_cost, chunk_seed, dtype)
+             for size, chunk_seed in zip(sizes, seeds)]
+
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_hedge_chunk, *zip(*tasks)))
+    else:
+        results = [_hedge_chunk(*task) for task in tasks]
+
+    pnl = numpy.concatenate([chunk_pnl for chunk_pnl, _ in results])
+    costs = numpy.concatenate([chunk_costs for _, chunk_costs in results])
+    return pnl, costs
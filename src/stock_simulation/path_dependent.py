@@ -0,0 +1,233 @@
+"""
+
+Path dependent options priced by Monte Carlo on the GBM process without
+storing the paths.
+
+The simulator advances every path by one time step and each accumulator
+folds the new prices into a running statistic in place:
+
+RunningAverage  : arithmetic average of the monitored prices (Asian)
+RunningMinimum  : lowest price seen so far (lookback, down barriers)
+RunningMaximum  : highest price seen so far (lookback, up barriers)
+BarrierMonitor  : per path flag set once the barrier has been touched
+
+Memory is O(paths) regardless of the number of steps.
+
+"""
+import numpy
+
+from ..BlackScholes.precision import _resolve_dtype
+from .stock_simulation import gbm_steps
+
+
+BARRIER_KINDS = ('up-and-out', 'up-and-in', 'down-and-out', 'down-and-in')
+
+
+class RunningAverage(object):
+    """Arithmetic average of the prices passed to ``update``."""
+
+    def __init__(self, paths, dtype=None):
+        self.total = numpy.zeros(paths, dtype=_resolve_dtype(dtype))
+        self.count = 0
+
+    def update(self, prices):
+        self.total += prices
+        self.count += 1
+
+    @property
+    def value(self):
+        return self.total / self.count
+
+
+class RunningMinimum(object):
+    """Lowest price seen on each path, starting from the initial price."""
+
+    def __init__(self, paths, S, dtype=None):
+        self.value = numpy.full(paths, S, dtype=_resolve_dtype(dtype))
+
+    def update(self, prices):
+        numpy.minimum(self.value, prices, out=self.value)
+
+
+class RunningMaximum(object):
+    """Highest price seen on each path, starting from the initial price."""
+
+    def __init__(self, paths, S, dtype=None):
+        self.value = numpy.full(paths, S, dtype=_resolve_dtype(dtype))
+
+    def update(self, prices):
+        numpy.maximum(self.value, prices, out=self.value)
+
+
+class BarrierMonitor(object):
+    """Flag the paths whose price has touched ``barrier`` from below ('up') or above ('down')."""
+
+    def __init__(self, paths, barrier, direction):
+        if direction not in ('up', 'down'):
+            raise ValueError("direction must be 'up' or 'down', got %r" % direction)
+        self.barrier = barrier
+        self.compare = numpy.greater_equal if direction == 'up' else numpy.less_equal
+        self.value = numpy.zeros(paths, dtype=bool)
+        self._touched = numpy.empty(paths, dtype=bool)
+
+    def update(self, prices):
+        self.compare(prices, self.barrier, out=self._touched)
+        self.value |= self._touched
+
+
+def simulate(S, r, sigma, t, steps, paths, accumulators, seed=None, dtype=None):
+    """Run risk-neutral GBM paths through ``accumulators`` and return the terminal prices.
+
+    :param S: initial stock price
+    :type S: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param sigma: annualized volatility
+    :type sigma: float
+    :param t: time to expiration in years
+    :type t: float
+    :param steps: number of monitoring dates
+    :type steps: int
+    :param paths: number of simulated paths
+    :type paths: int
+    :param accumulators: objects with an ``update(prices)`` method
+    :type accumulators: list
+    :param seed: seed or numpy.random.Generator
+    :type seed: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+    """
+
+    prices = None
+    for prices in gbm_steps(S, r, sigma, t, steps, paths, seed=seed, dtype=dtype):
+        for accumulator in accumulators:
+            accumulator.update(prices)
+    return prices
+
+
+def _discounted_mean(payoff, r, t):
+    return float(numpy.exp(-r * t) * payoff.mean(dtype=numpy.float64))
+
+
+def asian_option(flag, S, K, t, r, sigma, steps=252, paths=100000, seed=None, dtype=None):
+    """Return the Monte Carlo price of an arithmetic average price Asian option.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float
+    :param steps: number of averaging dates, equally spaced up to expiry
+    :type steps: int
+    :param paths: number of simulated paths
+    :type paths: int
+    :param seed: seed or numpy.random.Generator
+    :type seed: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+    """
+
+    average = RunningAverage(paths, dtype)
+    simulate(S, r, sigma, t, steps, paths, [average], seed=seed, dtype=dtype)
+
+    if flag == 'c':
+        payoff = numpy.maximum(average.value - K, 0.0)
+    else:
+        payoff = numpy.maximum(K - average.value, 0.0)
+    return _discounted_mean(payoff, r, t)
+
+
+def barrier_option(flag, S, K, H, t, r, sigma, kind='up-and-out', steps=252, paths=100000, seed=None,
+                   dtype=None):
+    """Return the Monte Carlo price of a discretely monitored knock-in or knock-out option.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param K: strike price
+    :type K: float
+    :param H: barrier level
+    :type H: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float
+    :param kind: one of 'up-and-out', 'up-and-in', 'down-and-out', 'down-and-in'
+    :type kind: str
+    :param steps: number of monitoring dates, equally spaced up to expiry
+    :type steps: int
+    :param paths: number of simulated paths
+    :type paths: int
+    :param seed: seed or numpy.random.Generator
+    :type seed: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+
+    The barrier is only checked on the simulated dates, which overprices
+    knock-out options relative to continuous monitoring.
+    """
+
+    if kind not in BARRIER_KINDS:
+        raise ValueError("kind must be one of %s, got %r" % (', '.join(BARRIER_KINDS), kind))
+    direction, _, knock = kind.split('-')
+
+    monitor = BarrierMonitor(paths, H, direction)
+    terminal = simulate(S, r, sigma, t, steps, paths, [monitor], seed=seed, dtype=dtype)
+
+    if flag == 'c':
+        payoff = numpy.maximum(terminal - K, 0.0)
+    else:
+        payoff = numpy.maximum(K - terminal, 0.0)
+
+    if knock == 'out':
+        payoff[monitor.value] = 0.0
+    else:
+        payoff[~monitor.value] = 0.0
+    return _discounted_mean(payoff, r, t)
+
+
+def lookback_option(flag, S, t, r, sigma, steps=252, paths=100000, seed=None, dtype=None):
+    """Return the Monte Carlo price of a floating strike lookback option.
+
+    The call pays S(T) - min S(t) and the put pays max S(t) - S(T), the
+    extremes being taken over the initial price and every monitoring date.
+
+    :param flag: 'c' or 'p' for call or put.
+    :type flag: str
+    :param S: underlying asset price
+    :type S: float
+    :param t: time to expiration in years
+    :type t: float
+    :param r: risk-free interest rate
+    :type r: float
+    :param sigma: annualized standard deviation, or volatility
+    :type sigma: float
+    :param steps: number of monitoring dates, equally spaced up to expiry
+    :type steps: int
+    :param paths: number of simulated paths
+    :type paths: int
+    :param seed: seed or numpy.random.Generator
+    :type seed: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+    """
+
+    if flag == 'c':
+        extreme = RunningMinimum(paths, S, dtype)
+        terminal = simulate(S, r, sigma, t, steps, paths, [extreme], seed=seed, dtype=dtype)
+        payoff = terminal - extreme.value
+    else:
+        extreme = RunningMaximum(paths, S, dtype)
+        terminal = simulate(S, r, sigma, t, steps, paths, [extreme], seed=seed, dtype=dtype)
+        payoff = extreme.value - terminal
+    return _discounted_mean(payoff, r, t)
@@ -0,0 +1,308 @@
+"""
+
+Realized volatility estimators for the sigma input of black_scholes.
+
+Close-to-close : sample standard deviation of log ( C(t) / C(t-1) )
+Parkinson      : sigma^2 = mean ( log ( H / L )^2 ) / ( 4 log 2 )
+Garman-Klass   : sigma^2 = mean ( 0.5 log ( H / L )^2 - ( 2 log 2 - 1 ) log ( C / O )^2 )
+EWMA           : sigma^2(t) = lambda * sigma^2(t-1) + ( 1 - lambda ) * r(t)^2  (RiskMetrics)
+
+Every estimator comes in two forms. The classes update in O(1) per new bar,
+keeping a ring buffer of the last ``window`` contributions and running sums,
+and work on a vector of tickers at once. The functions compute the whole
+history of a (bars x tickers) array in one vectorized pass. Both return
+annualized volatilities and agree with each other to rounding.
+
+"""
+import numpy
+from scipy.signal import lfilter
+
+
+TRADING_DAYS = 252
+_PARKINSON_FACTOR = 1.0 / (4.0 * numpy.log(2.0))
+_GARMAN_KLASS_FACTOR = 2.0 * numpy.log(2.0) - 1.0
+
+
+class _RollingSum(object):
+    """Ring buffer of the last ``window`` rows with their running sum.
+
+    The running sum is rebuilt from the buffer once per ``window`` updates,
+    which keeps the cost O(1) amortized and stops rounding errors from
+    accumulating over long histories.
+    """
+
+    def __init__(self, window, tickers):
+        self.window = window
+        self.buffer = numpy.zeros((window, tickers))
+        self.total = numpy.zeros(tickers)
+        self.count = 0
+        self.position = 0
+
+    def push(self, row):
+        self.total += row
+        self.total -= self.buffer[self.position]
+        self.buffer[self.position] = row
+        self.position += 1
+        self.count += 1
+        if self.position == self.window:
+            self.position = 0
+            numpy.sum(self.buffer, axis=0, out=self.total)
+
+    @property
+    def full(self):
+        return self.count >= self.window
+
+
+class CloseToClose(object):
+    """Rolling close-to-close volatility updated one bar at a time.
+
+    :param window: number of log returns in the window
+    :type window: int
+    :param tickers: number of underlyings updated together
+    :type tickers: int
+    :param annualization: bars per year
+    :type annualization: float
+
+    The window mean and sum of squared deviations are maintained with
+    Welford's update, replacing the oldest return by the newest in a single
+    step once the window is full, and rebuilt from the buffer once per window.
+    """
+
+    def __init__(self, window, tickers=1, annualization=TRADING_DAYS):
+        if window < 2:
+            raise ValueError("window must be at least 2, got %d" % window)
+        self.window = window
+        self.annualization = annualization
+        self.buffer = numpy.zeros((window, tickers))
+        self.mean = numpy.zeros(tickers)
+        self.m2 = numpy.zeros(tickers)
+        self.count = 0
+        self.position = 0
+        self.previous = None
+
+    def update(self, close):
+        """Add a closing price per ticker and return the annualized volatility (NaN until the window is full)."""
+
+        close = numpy.asarray(close, dtype=numpy.float64)
+        if self.previous is None:
+            self.previous = close.copy()
+            return numpy.full(self.mean.shape, numpy.nan)
+        x = numpy.log(close / self.previous)
+        self.previous[...] = close
+
+        if self.count < self.window:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            y = self.buffer[self.position]
+            old_mean = self.mean.copy()
+            self.mean += (x - y) / self.window
+            self.m2 += (x - y) * (x - self.mean + y - old_mean)
+            numpy.maximum(self.m2, 0.0, out=self.m2)
+        self.buffer[self.position] = x
+        self.position = (self.position + 1) % self.window
+        if self.position == 0 and self.count == self.window:
+            # rebuild from the buffer once per window, as _RollingSum does
+            numpy.mean(self.buffer, axis=0, out=self.mean)
+            deviations = self.buffer - self.mean
+            numpy.einsum('ij,ij->j', deviations, deviations, out=self.m2)
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return numpy.full(self.mean.shape, numpy.nan)
+        return numpy.sqrt(self.m2 / (self.window - 1) * self.annualization)
+
+
+class Parkinson(object):
+    """Rolling Parkinson high-low volatility updated one bar at a time.
+
+    Parameters are those of ``CloseToClose``, the window counts bars.
+    """
+
+    def __init__(self, window, tickers=1, annualization=TRADING_DAYS):
+        self.annualization = annualization
+        self.rolling = _RollingSum(window, tickers)
+
+    def update(self, high, low):
+        """Add a high and low per ticker and return the annualized volatility."""
+
+        log_hl = numpy.log(numpy.asarray(high, dtype=numpy.float64) / low)
+        self.rolling.push(log_hl * log_hl)
+        return self.value
+
+    @property
+    def value(self):
+        if not self.rolling.full:
+            return numpy.full(self.rolling.total.shape, numpy.nan)
+        variance = _PARKINSON_FACTOR * self.rolling.total / self.rolling.window
+        return numpy.sqrt(numpy.maximum(variance, 0.0) * self.annualization)
+
+
+class GarmanKlass(object):
+    """Rolling Garman-Klass OHLC volatility updated one bar at a time.
+
+    Parameters are those of ``CloseToClose``, the window counts bars.
+    """
+
+    def __init__(self, window, tickers=1, annualization=TRADING_DAYS):
+        self.annualization = annualization
+        self.rolling = _RollingSum(window, tickers)
+
+    def update(self, open_, high, low, close):
+        """Add an open, high, low and close per ticker and return the annualized volatility."""
+
+        self.rolling.push(_garman_klass_terms(open_, high, low, close))
+        return self.value
+
+    @property
+    def value(self):
+        if not self.rolling.full:
+            return numpy.full(self.rolling.total.shape, numpy.nan)
+        variance = self.rolling.total / self.rolling.window
+        return numpy.sqrt(numpy.maximum(variance, 0.0) * self.annualization)
+
+
+class EWMA(object):
+    """Exponentially weighted volatility of log returns updated one bar at a time.
+
+    :param lam: decay factor, 0.94 is the RiskMetrics daily value
+    :type lam: float
+    :param tickers: number of underlyings updated together
+    :type tickers: int
+    :param annualization: bars per year
+    :type annualization: float
+
+    The variance is seeded with the first squared return.
+    """
+
+    def __init__(self, lam=0.94, tickers=1, annualization=TRADING_DAYS):
+        self.lam = lam
+        self.annualization = annualization
+        self.variance = numpy.full(tickers, numpy.nan)
+        self.previous = None
+        self.seeded = False
+
+    def update(self, close):
+        """Add a closing price per ticker and return the annualized volatility."""
+
+        close = numpy.asarray(close, dtype=numpy.float64)
+        if self.previous is None:
+            self.previous = close.copy()
+            return self.value
+        x = numpy.log(close / self.previous)
+        self.previous[...] = close
+        if not self.seeded:
+            self.variance = x * x
+            self.seeded = True
+        else:
+            self.variance *= self.lam
+            self.variance += (1.0 - self.lam) * x * x
+        return self.value
+
+    @property
+    def value(self):
+        return numpy.sqrt(self.variance * self.annualization)
+
+
+def _garman_klass_terms(open_, high, low, close):
+    log_hl = numpy.log(numpy.asarray(high, dtype=numpy.float64) / low)
+    log_co = numpy.log(numpy.asarray(close, dtype=numpy.float64) / open_)
+    return 0.5 * log_hl * log_hl - _GARMAN_KLASS_FACTOR * log_co * log_co
+
+
+def _rolling_sum(values, window, out):
+    """Write the sum of each trailing ``window`` of rows into ``out``, NaN where fewer rows are available.
+
+    ``values`` is overwritten with its running sum; working in place matters
+    at 10 years x 5000 tickers, where every temporary is another 100 MB.
+    """
+
+    if values.shape[0] < window:
+        out[...] = numpy.nan
+        return out
+    out[:window - 1] = numpy.nan
+    numpy.cumsum(values, axis=0, out=values)
+    out[window - 1] = values[window - 1]
+    numpy.subtract(values[window:], values[:-window], out=out[window:])
+    return out
+
+
+def _annualize(variance, annualization):
+    """Turn a variance array into an annualized volatility in place."""
+
+    numpy.maximum(variance, 0.0, out=variance)
+    variance *= annualization
+    return numpy.sqrt(variance, out=variance)
+
+
+def close_to_close_volatility(close, window, annualization=TRADING_DAYS):
+    """Rolling close-to-close volatility over the whole history.
+
+    :param close: closing prices, bars along the first axis
+    :type close: numpy.ndarray
+    :param window: number of log returns in the window
+    :type window: int
+    :param annualization: bars per year
+    :type annualization: float
+    :returns: array shaped like ``close``, NaN for the first ``window`` bars
+    """
+
+    result = numpy.log(numpy.asarray(close, dtype=numpy.float64))
+    returns = result[1:] - result[:-1]
+    # demeaning by the first return keeps the sum of squares well conditioned
+    returns -= returns[:1]
+    squares = returns * returns
+
+    sums = _rolling_sum(returns, window, out=result[1:])
+    sum_of_squares = _rolling_sum(squares, window, out=returns)
+
+    numpy.square(sums, out=sums)
+    sums /= -window
+    sums += sum_of_squares
+    sums /= window - 1
+    _annualize(sums, annualization)
+    result[:1] = numpy.nan
+    return result
+
+
+def parkinson_volatility(high, low, window, annualization=TRADING_DAYS):
+    """Rolling Parkinson volatility over the whole history, NaN for the first ``window - 1`` bars."""
+
+    terms = numpy.asarray(high, dtype=numpy.float64) / low
+    numpy.log(terms, out=terms)
+    numpy.square(terms, out=terms)
+    variance = _rolling_sum(terms, window, out=numpy.empty_like(terms))
+    variance *= _PARKINSON_FACTOR / window
+    return _annualize(variance, annualization)
+
+
+def garman_klass_volatility(open_, high, low, close, window, annualization=TRADING_DAYS):
+    """Rolling Garman-Klass volatility over the whole history, NaN for the first ``window - 1`` bars."""
+
+    terms = _garman_klass_terms(open_, high, low, close)
+    variance = _rolling_sum(terms, window, out=numpy.empty_like(terms))
+    variance /= window
+    return _annualize(variance, annualization)
+
+
+def ewma_volatility(close, lam=0.94, annualization=TRADING_DAYS):
+    """EWMA volatility over the whole history, NaN for the first bar.
+
+    The recursion runs as a first order IIR filter along the bar axis, so
+    every ticker is processed in one call.
+    """
+
+    close = numpy.asarray(close, dtype=numpy.float64)
+    returns = numpy.diff(numpy.log(close), axis=0)
+    squared = returns * returns
+
+    result = numpy.full(close.shape, numpy.nan)
+    if squared.shape[0]:
+        initial = lam * squared[:1]
+        variance, _ = lfilter([1.0 - lam], [1.0, -lam], squared, axis=0, zi=initial)
+        result[1:] = numpy.sqrt(variance * annualization)
+    return result
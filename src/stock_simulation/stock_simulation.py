@@ -22,4 +22,78 @@ theta E R   : long term mean
 sigma > 0   : volatility coefficient
 and W(t) is a Wiener
 
-"""
\ No newline at end of file
+"""
+import numpy
+
+from ..BlackScholes.precision import _resolve_dtype
+
+
+def _log_increments(mu, sigma, t, steps):
+    """Return the per step drift and diffusion of log ( S(t) ) under GBM."""
+
+    dt = t / float(steps)
+    return (mu - 0.5 * sigma * sigma) * dt, sigma * numpy.sqrt(dt)
+
+
+def gbm_paths(S, mu, sigma, t, steps, paths, seed=None, dtype=None):
+    """Simulate GBM paths and return the full paths x (steps + 1) matrix.
+
+    :param S: initial stock price
+    :type S: float
+    :param mu: drift, the risk-free rate for risk-neutral pricing
+    :type mu: float
+    :param sigma: annualized volatility
+    :type sigma: float
+    :param t: horizon in years
+    :type t: float
+    :param steps: number of time steps
+    :type steps: int
+    :param paths: number of simulated paths
+    :type paths: int
+    :param seed: seed or numpy.random.Generator
+    :type seed: int
+    :param dtype: numpy.float64 (default) or numpy.float32
+    :type dtype: numpy.dtype
+
+    Memory grows with paths * steps; prefer ``gbm_steps`` whenever only running
+    statistics of the paths are needed. Both functions draw the same normals
+    for the same seed, so their prices agree path for path.
+    """
+
+    dtype = _resolve_dtype(dtype)
+    rng = numpy.random.default_rng(seed)
+    drift, diffusion = _log_increments(mu, sigma, t, steps)
+
+    log_returns = rng.standard_normal((steps, paths), dtype=dtype).T
+    log_returns *= diffusion
+    log_returns += drift
+
+    prices = numpy.empty((paths, steps + 1), dtype=dtype)
+    prices[:, 0] = 0.0
+    numpy.cumsum(log_returns, axis=1, out=prices[:, 1:])
+    numpy.exp(prices, out=prices)
+    prices *= S
+    return prices
+
+
+def gbm_steps(S, mu, sigma, t, steps, paths, seed=None, dtype=None):
+    """Advance GBM paths one time step at a time.
+
+    Yields the vector of current prices after every step. The same array is
+    updated in place and yielded each time, so memory stays O(paths); copy it
+    if a step has to be kept. Parameters are those of ``gbm_paths``.
+    """
+
+    dtype = _resolve_dtype(dtype)
+    rng = numpy.random.default_rng(seed)
+    drift, diffusion = _log_increments(mu, sigma, t, steps)
+
+    prices = numpy.full(paths, S, dtype=dtype)
+    growth = numpy.empty(paths, dtype=dtype)
+    for _ in range(steps):
+        rng.standard_normal(out=growth, dtype=dtype)
+        growth *= diffusion
+        growth += drift
+        numpy.exp(growth, out=growth)
+        prices *= growth
+        yield prices
@@ -0,0 +1,43 @@
+import numpy
+
+from src.BlackScholes import black_scholes
+from src.stock_simulation import delta_hedge
+
+
+def test_delta_hedge_hull_table():
+    """Hull Table 19.7, 20 week call rebalanced every 5 weeks and every week."""
+    S, K, r, sigma, t, mu = 49, 50, 0.05, 0.20, 20 / 52., 0.13
+    option_price = black_scholes('c', S, K, t, r, sigma)
+
+    pnl, costs = delta_hedge('c', S, K, t, r, sigma, mu=mu, rebalances=4, paths=20000, seed=0)
+    print("Every 5 weeks : %2.3f" % (pnl.std() / option_price))
+    assert abs(pnl.std() / option_price - 0.42) < 0.03
+
+    pnl, costs = delta_hedge('c', S, K, t, r, sigma, mu=mu, rebalances=20, paths=20000, seed=0)
+    print("Every week : %2.3f" % (pnl.std() / option_price))
+    assert abs(pnl.std() / option_price - 0.19) < 0.02
+    assert abs(pnl.mean()) < 0.02
+    assert numpy.all(costs == 0.0)
+
+
+def test_delta_hedge_costs_and_modes():
+    arguments = ('p', 100.0, 100.0, 0.5, 0.03, 0.25)
+    options = dict(rebalances=50, paths=6000, transaction_cost=0.001, chunk_size=2500, seed=3)
+    pnl, costs = delta_hedge(*arguments, **options)
+    assert pnl.shape == costs.shape == (6000,)
+    assert numpy.all(costs > 0.0)
+    print("Mean cost : %2.4f Mean P&L : %2.4f" % (costs.mean(), pnl.mean()))
+    assert abs(pnl.mean() + costs.mean()) < 0.05
+
+    pooled_pnl, pooled_costs = delta_hedge(*arguments, processes=2, **options)
+    assert numpy.array_equal(pnl, pooled_pnl)
+    assert numpy.array_equal(costs, pooled_costs)
+
+
+def test_delta_hedge_dtype():
+    arguments = ('c', 49.0, 50.0, 20 / 52., 0.05, 0.20)
+    options = dict(rebalances=20, paths=2000, transaction_cost=0.001, seed=0)
+    for dtype in (numpy.float64, numpy.float32):
+        pnl, costs = delta_hedge(*arguments, dtype=dtype, **options)
+        assert pnl.dtype == dtype
+        assert costs.dtype == dtype
@@ -0,0 +1,61 @@
+import numpy
+
+from src.BlackScholes import crank_nicolson, black_scholes, delta, gamma, RateCurve
+
+
+def test_crank_nicolson_matches_black_scholes():
+    S, r, sigma, t = 42, 0.10, 0.20, 0.50
+    K = numpy.array([30.0, 35.0, 40.0, 45.0, 50.0])
+    for flag in ('c', 'p'):
+        price, fd_delta, fd_gamma = crank_nicolson(flag, S, K, t, r, sigma)
+        expected = black_scholes(flag, S, K, t, r, sigma)
+        print("%s FD : %s Closed Form : %s" % (flag, price, expected))
+        assert numpy.all(numpy.abs(price - expected) < 0.001)
+        assert numpy.all(numpy.abs(fd_delta - delta(flag, S, K, t, r, sigma)) < 0.001)
+        assert numpy.all(numpy.abs(fd_gamma - gamma(S, K, t, r, sigma)) < 0.001)
+
+
+def test_crank_nicolson_scalar_strike():
+    S, K, r, sigma, t = 49, 50, 0.05, 0.2, 0.3846
+    price, fd_delta, fd_gamma = crank_nicolson('c', S, K, t, r, sigma)
+    assert numpy.ndim(price) == 0
+    assert abs(price - black_scholes('c', S, K, t, r, sigma)) < 0.001
+
+
+def test_crank_nicolson_american_put():
+    """Hull Example 21.1, the American put converges to 4.28 as the tree is refined."""
+    S, K, r, sigma, t = 50, 50, 0.10, 0.40, 0.4167
+    american, _, _ = crank_nicolson('p', S, K, t, r, sigma, american=True, s_steps=800, t_steps=400)
+    european = black_scholes('p', S, K, t, r, sigma)
+    print("American Put : %2.5f European Put : %2.5f" % (american, european))
+    assert abs(american - 4.28) < 0.01
+    assert american > european
+
+    american_call, _, _ = crank_nicolson('c', S, K, t, r, sigma, american=True)
+    assert abs(american_call - black_scholes('c', S, K, t, r, sigma)) < 0.005
+
+
+def test_crank_nicolson_rate_curve():
+    S, sigma, t = 42, 0.20, 0.50
+    K = numpy.array([35.0, 40.0, 45.0])
+    curve = RateCurve([0.1, 0.25, 1.0], [0.02, 0.05, 0.08])
+    for flag in ('c', 'p'):
+        price, _, _ = crank_nicolson(flag, S, K, t, curve, sigma)
+        assert numpy.all(numpy.abs(price - black_scholes(flag, S, K, t, curve, sigma)) < 0.001)
+
+
+def test_crank_nicolson_without_diffusion():
+    # deep in the money calls, where S used to land on the last node of the grid
+    price, fd_delta, fd_gamma = crank_nicolson('c', 100, 10.0, 1.0, 0.05, 0.0)
+    assert abs(price - (100 - 10.0 * numpy.exp(-0.05))) < 1e-12
+    assert fd_delta == 1.0 and fd_gamma == 0.0
+    price, fd_delta, fd_gamma = crank_nicolson('c', 100, 40.0, 0.0, 0.05, 0.2)
+    assert price == 60.0 and fd_delta == 1.0 and fd_gamma == 0.0
+
+    american, american_delta, _ = crank_nicolson('p', 40, 50.0, 0.5, 0.05, 0.0, american=True)
+    assert american == 10.0 and american_delta == -1.0
+
+    # with diffusion S stays on an interior node even when every strike is far below it
+    price, fd_delta, _ = crank_nicolson('c', 100, 10.0, 0.25, 0.05, 0.01)
+    assert abs(price - black_scholes('c', 100, 10.0, 0.25, 0.05, 0.01)) < 1e-6
+    assert abs(fd_delta - 1.0) < 1e-6
@@ -0,0 +1,69 @@
+import numpy
+from scipy.integrate import quad
+from scipy.special import factorial
+
+from src.BlackScholes import fft_price, black_scholes, RateCurve
+from src.BlackScholes.fourier import heston_characteristic_function
+from src.option_chain import simulate_options_chain
+
+
+def test_fft_matches_black_scholes_on_chain_strikes():
+    S, r, sigma, T = 100.0, 0.05, 0.30, 30
+    chain = simulate_options_chain(T, S=S, sigma=sigma, r=r)
+    K = chain.index.to_numpy()
+    for flag, column in (('c', 'call'), ('p', 'put')):
+        prices = fft_price(flag, S, K, T / 365, r, sigma=sigma)
+        print("%s max error : %.2e" % (flag, numpy.abs(prices - chain[column]).max()))
+        assert numpy.all(numpy.abs(prices - chain[column].to_numpy()) < 1e-5)
+
+
+def test_fft_merton_matches_series():
+    """Merton (1976) prices a jump-diffusion as a Poisson mixture of Black-Scholes prices."""
+    S, r, sigma, t = 100.0, 0.05, 0.20, 0.5
+    lam, mu_j, sigma_j = 0.75, -0.10, 0.15
+    K = numpy.array([80.0, 90.0, 100.0, 110.0, 120.0])
+
+    compensator = numpy.exp(mu_j + 0.5 * sigma_j ** 2) - 1.0
+    lam_prime = lam * (1.0 + compensator)
+    expected = numpy.zeros_like(K)
+    for n in range(60):
+        sigma_n = numpy.sqrt(sigma ** 2 + n * sigma_j ** 2 / t)
+        r_n = r - lam * compensator + n * numpy.log(1.0 + compensator) / t
+        weight = numpy.exp(-lam_prime * t) * (lam_prime * t) ** n / factorial(n)
+        expected += weight * black_scholes('c', S, K, t, r_n, sigma_n)
+
+    prices = fft_price('c', S, K, t, r, model='merton', sigma=sigma, lam=lam, mu_j=mu_j, sigma_j=sigma_j)
+    print("Merton FFT : %s Series : %s" % (prices, expected))
+    assert numpy.all(numpy.abs(prices - expected) < 1e-5)
+
+
+def test_fft_heston_matches_direct_integration():
+    S, r, t = 100.0, 0.03, 1.0
+    params = dict(v0=0.04, kappa=1.5, theta=0.04, xi=0.3, rho=-0.7)
+    K = numpy.array([80.0, 100.0, 120.0])
+
+    def phi(u):
+        return heston_characteristic_function(u, S, t, r, **params)
+
+    def gil_pelaez(k):
+        log_k = numpy.log(k)
+        forward = phi(-1j)
+        p1 = 0.5 + quad(lambda u: (numpy.exp(-1j * u * log_k) * phi(u - 1j) / (1j * u * forward)).real,
+                        0, 200, limit=500)[0] / numpy.pi
+        p2 = 0.5 + quad(lambda u: (numpy.exp(-1j * u * log_k) * phi(u) / (1j * u)).real,
+                        0, 200, limit=500)[0] / numpy.pi
+        return S * p1 - k * numpy.exp(-r * t) * p2
+
+    expected = numpy.array([gil_pelaez(k) for k in K])
+    prices = fft_price('c', S, K, t, r, model='heston', **params)
+    print("Heston FFT : %s Integration : %s" % (prices, expected))
+    assert numpy.all(numpy.abs(prices - expected) < 1e-5)
+
+
+def test_fft_rate_curve():
+    S, sigma, t = 100.0, 0.30, 0.75
+    K = numpy.array([80.0, 100.0, 120.0])
+    curve = RateCurve([0.25, 0.5, 1.0], [0.02, 0.03, 0.05])
+    for flag in ('c', 'p'):
+        prices = fft_price(flag, S, K, t, curve, sigma=sigma)
+        assert numpy.all(numpy.abs(prices - black_scholes(flag, S, K, t, curve, sigma)) < 1e-5)
@@ -1,3 +1,7 @@
+import warnings
+
+import numpy
+
 from src.BlackScholes import _d1, _d2, black_scholes, delta, theta, gamma, vega, rho, futures
 
 
@@ -147,3 +151,32 @@ def test_futures_price():
     pre_calculated = 1313.07
     print("Futures Prie : %2.6f , TextBook Futures Price : %2.6f" % (F, pre_calculated))
     assert abs(F - pre_calculated) < 0.01
+
+
+def test_expired_and_zero_volatility():
+    assert True
+
+    S = numpy.array([50.0, 40.0, 60.0, 60.0, 40.0, 50.0])
+    K = 50.0
+    r = 0.05
+    t = numpy.array([0.0, 0.0, 0.0, 0.5, 0.5, -0.1])
+    sigma = numpy.array([0.2, 0.2, 0.2, 0.0, 0.0, 0.2])
+    discounted_strike = K * numpy.exp(-r * numpy.maximum(t, 0.0))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        call = black_scholes('c', S, K, t, r, sigma)
+        put = black_scholes('p', S, K, t, r, sigma)
+        call_delta = delta('c', S, K, t, r, sigma)
+        gamma_calc = gamma(S, K, t, r, sigma)
+        vega_calc = vega(S, K, t, r, sigma)
+        theta_calc = theta('c', S, K, t, r, sigma)
+
+    print("Call : %s Put : %s" % (call, put))
+    assert numpy.allclose(call, numpy.maximum(S - discounted_strike, 0.0))
+    assert numpy.allclose(put, numpy.maximum(discounted_strike - S, 0.0))
+    assert numpy.allclose(call_delta, [0.5, 0.0, 1.0, 1.0, 0.0, 0.5])
+    assert numpy.all(gamma_calc == 0.0)
+    assert numpy.all(vega_calc == 0.0)
+    assert numpy.all(numpy.isfinite(theta_calc))
+    assert numpy.all(numpy.isfinite(_d1(S, K, t, r, sigma)) == [True, False, False, False, False, True])
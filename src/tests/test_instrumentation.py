@@ -0,0 +1,68 @@
+import json
+import sys
+import types
+
+import numpy
+
+from src.BlackScholes import black_scholes, profiling, snapshot, dump_json, dump_prometheus
+from src.BlackScholes import greeks, instrumentation
+from src.option_chain import option_chain
+
+
+def test_disabled_records_nothing():
+    instrumentation.reset()
+    black_scholes('c', 42, 40, 0.5, 0.10, 0.2)
+    assert snapshot() == {}
+
+
+def test_helpers_rebound_inside_the_package_only():
+    outside = types.ModuleType('outside_the_package')
+    outside.cdf = greeks._cdf
+    sys.modules[outside.__name__] = outside
+    try:
+        assert not hasattr(greeks._d1, '__wrapped__')
+        assert not hasattr(greeks._cdf, '__wrapped__')
+        with profiling():
+            assert greeks._d1.__wrapped__ is not None
+            assert greeks._cdf.__wrapped__ is outside.cdf
+            assert not hasattr(outside.cdf, '__wrapped__')
+        assert not hasattr(greeks._d1, '__wrapped__')
+        assert greeks._cdf is outside.cdf
+    finally:
+        del sys.modules[outside.__name__]
+
+
+def test_profiling_counts_calls_and_elements():
+    S = numpy.linspace(40.0, 60.0, 100)
+    with profiling() as stats:
+        black_scholes('c', S, 50, 0.5, 0.10, 0.2)
+        black_scholes('p', S, 50, 0.5, 0.10, 0.2)
+        option_chain(S, 50, 140, 0.2, 0.05)
+    assert not instrumentation.is_enabled()
+
+    print(stats)
+    assert stats['black_scholes']['calls'] == 2
+    assert stats['black_scholes']['elements'] == 200
+    assert stats['option_chain']['calls'] == 1
+    assert stats['option_chain']['elements'] == 100
+    assert stats['_d1']['calls'] == 2
+    assert stats['norm.cdf']['calls'] >= 4
+    assert sum(stats['black_scholes']['buckets'].values()) == 2
+
+
+def test_dumps(tmp_path):
+    with profiling():
+        option_chain(49, 50, 140, 0.2, 0.05)
+
+    json_path = str(tmp_path / 'stats.json')
+    dump_json(json_path)
+    with open(json_path) as handle:
+        assert json.load(handle)['option_chain']['calls'] == 1
+
+    prom_path = str(tmp_path / 'stats.prom')
+    dump_prometheus(prom_path)
+    with open(prom_path) as handle:
+        text = handle.read()
+    print(text)
+    assert 'blackscholes_calls_total{function="option_chain"} 1' in text
+    assert 'blackscholes_latency_seconds_bucket{function="option_chain",le="+Inf"} 1' in text
@@ -1,4 +1,8 @@
-from src.option_chain import option_chain
+import warnings
+
+import numpy
+
+from src.option_chain import option_chain, simulate_options_chain
 
 
 def test_option_chain():
@@ -153,3 +157,32 @@ def test_option_chain_2():
     print("Calc Vega : %2.6f , TextBook Vega : %2.6f" % (vega, vega_text_book))
     assert abs(vega - vega_text_book) < .01
 
+
+def test_simulate_options_chain():
+    assert True
+
+    chain = simulate_options_chain(30, S=263.0, sigma=0.25, r=0.05, strikes=5)
+    strikes = chain.index.to_numpy()
+    print(chain[['call', 'put']])
+    assert list(strikes) == [210.0, 220.0, 230.0, 240.0, 250.0, 260.0, 270.0, 280.0, 290.0, 300.0, 310.0]
+
+    call, put = option_chain(263.0, 260.0, 30, 0.25, 0.05)[2:4]
+    assert abs(chain.loc[260.0, 'call'] - call) < 1e-12
+    assert abs(chain.loc[260.0, 'put'] - put) < 1e-12
+
+
+def test_option_chain_expired_rows():
+    assert True
+
+    S = numpy.array([42.0, 42.0, 38.0])
+    T = numpy.array([365 / 2, 0.0, 0.0])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        d1, d2, call, put, put_delta, call_delta, call_theta, \
+            put_theta, gamma, vega, call_rho, put_rho = option_chain(S, 40, T, 0.2, 0.10)
+
+    assert abs(call[0] - 4.76) < 0.01
+    assert numpy.allclose(call[1:], [2.0, 0.0])
+    assert numpy.allclose(put[1:], [0.0, 2.0])
+    assert numpy.allclose(call_delta[1:], [1.0, 0.0])
+    assert numpy.all(gamma[1:] == 0.0)
@@ -0,0 +1,36 @@
+import numpy
+
+from src.BlackScholes import black_scholes
+from src.stock_simulation import gbm_paths, gbm_steps, asian_option, barrier_option, lookback_option
+
+
+def test_gbm_steps_matches_full_matrix():
+    S, r, sigma, t, steps, paths = 100, 0.05, 0.3, 1.0, 50, 1000
+    matrix = gbm_paths(S, r, sigma, t, steps, paths, seed=7)
+    for step, prices in enumerate(gbm_steps(S, r, sigma, t, steps, paths, seed=7), start=1):
+        assert numpy.allclose(prices, matrix[:, step], rtol=1e-10)
+
+
+def test_barrier_parity():
+    S, K, H, t, r, sigma = 100, 100, 120, 1.0, 0.05, 0.3
+    knock_out = barrier_option('c', S, K, H, t, r, sigma, kind='up-and-out', seed=1)
+    knock_in = barrier_option('c', S, K, H, t, r, sigma, kind='up-and-in', seed=1)
+    vanilla = black_scholes('c', S, K, t, r, sigma)
+    print("Out : %2.5f In : %2.5f Vanilla : %2.5f" % (knock_out, knock_in, vanilla))
+    assert abs(knock_out + knock_in - vanilla) < 0.15
+    assert 0 < knock_out < vanilla
+
+
+def test_asian_and_lookback():
+    S, K, t, r, sigma = 50, 50, 0.25, 0.10, 0.40
+    asian_call = asian_option('c', S, K, t, r, sigma, seed=3)
+    vanilla = black_scholes('c', S, K, t, r, sigma)
+    print("Asian Call : %2.5f Vanilla Call : %2.5f" % (asian_call, vanilla))
+    assert 0 < asian_call < vanilla
+
+    steps, paths = 63, 20000
+    matrix = gbm_paths(S, r, sigma, t, steps, paths, seed=5)
+    expected = numpy.exp(-r * t) * (matrix[:, -1] - matrix.min(axis=1)).mean()
+    lookback_call = lookback_option('c', S, t, r, sigma, steps=steps, paths=paths, seed=5)
+    print("Lookback Call : %2.5f Full Matrix : %2.5f" % (lookback_call, expected))
+    assert abs(lookback_call - expected) < 1e-8
@@ -0,0 +1,66 @@
+import importlib
+
+import numpy
+
+from src.BlackScholes import black_scholes, delta, get_dtype, precision, FLOAT32, FLOAT64
+from src.option_chain import option_chain, accuracy_report
+
+# the package re-exports the precision() context manager under the module name
+precision_module = importlib.import_module('src.BlackScholes.precision')
+
+
+def test_default_dtype():
+    assert get_dtype() is FLOAT64
+    S, K, r, sigma, t = 42, 40, 0.10, 0.20, 0.50
+    calculated_call = black_scholes('c', S, K, t, r, sigma)
+    assert calculated_call.dtype == FLOAT64
+    assert abs(calculated_call - 4.76) < 0.01
+
+
+def test_float32_pricers():
+    S = numpy.array([42.0, 49.0])
+    K = numpy.array([40.0, 50.0])
+    t = numpy.array([0.5, 0.3846])
+    r = numpy.array([0.10, 0.05])
+    sigma = numpy.array([0.20, 0.20])
+
+    reference = black_scholes('c', S, K, t, r, sigma)
+    single = black_scholes('c', S, K, t, r, sigma, dtype=FLOAT32)
+    print("float64 : %s float32 : %s" % (reference, single))
+    assert single.dtype == FLOAT32
+    assert numpy.all(numpy.abs(single - reference) / reference < 1e-5)
+
+    with precision(FLOAT32):
+        assert get_dtype() is FLOAT32
+        assert delta('p', S, K, t, r, sigma).dtype == FLOAT32
+    assert get_dtype() is FLOAT64
+
+
+def test_option_chain_float32():
+    S, K, r, sigma, T = 49, 50, 0.05, 0.2, 140
+    outputs = option_chain(S, K, T, sigma, r, dtype=FLOAT32)
+    reference = option_chain(S, K, T, sigma, r)
+    for single, double in zip(outputs, reference):
+        assert single.dtype == FLOAT32
+        assert abs(single - double) < 1e-5
+
+
+def test_accuracy_report():
+    report = accuracy_report(size=10000)
+    for name, row in report.items():
+        print("%s : %s" % (name, row))
+        assert row['p99_rel_error'] < 1e-5
+    for name in ('call', 'put'):
+        assert report[name]['max_rel_error'] < 5e-5
+
+
+def test_float32_prices_in_chunks(monkeypatch):
+    rng = numpy.random.default_rng(1)
+    S = rng.uniform(10.0, 500.0, 1000).astype(FLOAT32)
+    K = (S * numpy.exp(rng.uniform(-0.5, 0.5, 1000))).astype(FLOAT32)
+    whole = option_chain(S, K, 30, 0.3, 0.05, dtype=FLOAT32)[2:4]
+    monkeypatch.setattr(precision_module, '_CHUNK_SIZE', 64)
+    chunked = option_chain(S, K, 30, 0.3, 0.05, dtype=FLOAT32)[2:4]
+    for single, reference in zip(chunked, whole):
+        assert single.dtype == FLOAT32
+        assert numpy.array_equal(single, reference)
@@ -0,0 +1,68 @@
+import numpy
+
+from src.BlackScholes import RateCurve, black_scholes, rho, theta
+from src.option_chain import option_chain
+
+
+def test_flat_curve_matches_flat_rate():
+    S, K, r, sigma, t = 42, 40, 0.10, 0.20, 0.50
+    curve = RateCurve.flat(r)
+    for flag in ('c', 'p'):
+        assert abs(black_scholes(flag, S, K, t, curve, sigma) - black_scholes(flag, S, K, t, r, sigma)) < 1e-12
+        assert abs(theta(flag, S, K, t, curve, sigma) - theta(flag, S, K, t, r, sigma)) < 1e-12
+        assert abs(rho(flag, S, K, t, curve, sigma) - rho(flag, S, K, t, r, sigma)) < 1e-12
+
+    chain = option_chain(S, K, 365 / 2, sigma, curve)
+    reference = option_chain(S, K, 365 / 2, sigma, r)
+    for with_curve, flat in zip(chain, reference):
+        assert abs(with_curve - flat) < 1e-12
+
+
+def test_interpolation():
+    curve = RateCurve([0.5, 1.0, 2.0], [0.02, 0.03, 0.04])
+    assert abs(curve.discount(1.0) - numpy.exp(-0.03)) < 1e-15
+    assert abs(curve.zero_rate(2.0) - 0.04) < 1e-15
+
+    # log-linear interpolation keeps the forward rate flat between pillars
+    forward = (0.03 * 1.0 - 0.02 * 0.5) / 0.5
+    assert abs(curve.forward_rate(0.6, 0.9) - forward) < 1e-12
+    # and the last forward rate is held flat beyond the last pillar
+    assert abs(curve.forward_rate(3.0, 4.0) - curve.forward_rate(1.0, 2.0)) < 1e-12
+
+    linear = RateCurve([0.5, 1.0, 2.0], [0.02, 0.03, 0.04], interpolation='linear')
+    expected = 0.5 * (numpy.exp(-0.01) + numpy.exp(-0.03))
+    assert abs(linear.discount(0.75) - expected) < 1e-15
+
+
+def test_chain_reuses_discount_per_expiry():
+    curve = RateCurve([0.25, 0.5, 1.0], [0.03, 0.035, 0.04])
+    for T in (30.0, 60.0, 90.0):
+        option_chain(100.0, numpy.linspace(80.0, 120.0, 50), T, 0.25, curve)
+    assert len(curve._cache) == 3
+
+    # a single call over several expiries evaluates each distinct one once
+    expiries = numpy.repeat([30.0, 60.0, 120.0], 50)
+    strikes = numpy.tile(numpy.linspace(80.0, 120.0, 50), 3)
+    call = option_chain(100.0, strikes, expiries, 0.25, curve)[2]
+    assert len(curve._cache) == 4
+
+    t = expiries / 365
+    expected = black_scholes('c', 100.0, strikes, t, curve.zero_rate(t), 0.25)
+    assert numpy.all(numpy.abs(call - expected) < 1e-12)
+
+
+def test_cache_is_bounded():
+    curve = RateCurve([0.5, 1.0], [0.02, 0.03])
+    curve.CACHE_SIZE = 8
+    for expiry in numpy.linspace(0.1, 2.0, 20):
+        curve.discount(expiry)
+        assert len(curve._cache) <= 8
+
+    expiries = numpy.linspace(0.1, 2.0, 6)
+    assert numpy.allclose(curve.discount(numpy.tile(expiries, 3)), numpy.tile(curve._interpolate(expiries), 3))
+    assert len(curve._cache) <= 8
+
+    # more distinct expiries than the cache holds are evaluated without being cached
+    expiries = numpy.linspace(0.1, 2.0, 100)
+    assert numpy.allclose(curve.zero_rate(expiries), curve._zero_rates(expiries))
+    assert len(curve._cache) <= 8
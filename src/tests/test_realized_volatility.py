@@ -0,0 +1,56 @@
+import numpy
+import pandas
+
+from src.stock_simulation import gbm_paths
+from src.stock_simulation import CloseToClose, Parkinson, GarmanKlass, EWMA
+from src.stock_simulation import close_to_close_volatility, parkinson_volatility, garman_klass_volatility, \
+    ewma_volatility
+
+
+def _ohlc(bars=300, tickers=4, seed=0):
+    rng = numpy.random.default_rng(seed)
+    close = gbm_paths(100.0, 0.05, 0.3, bars / 252.0, bars - 1, tickers, seed=seed).T
+    open_ = close * numpy.exp(rng.normal(0.0, 0.005, close.shape))
+    high = numpy.maximum(open_, close) * numpy.exp(numpy.abs(rng.normal(0.0, 0.01, close.shape)))
+    low = numpy.minimum(open_, close) * numpy.exp(-numpy.abs(rng.normal(0.0, 0.01, close.shape)))
+    return open_, high, low, close
+
+
+def test_close_to_close_matches_pandas():
+    _, _, _, close = _ohlc()
+    window = 21
+    expected = numpy.log(pandas.DataFrame(close)).diff().rolling(window).std().to_numpy() * numpy.sqrt(252)
+    batch = close_to_close_volatility(close, window)
+    assert numpy.array_equal(numpy.isnan(batch), numpy.isnan(expected))
+    assert numpy.nanmax(numpy.abs(batch - expected)) < 1e-10
+
+    estimator = CloseToClose(window, tickers=close.shape[1])
+    streamed = numpy.array([estimator.update(row) for row in close])
+    print("Last streamed : %s pandas : %s" % (streamed[-1], expected[-1]))
+    assert numpy.nanmax(numpy.abs(streamed - expected)) < 1e-10
+
+
+def test_range_estimators_stream_like_batch():
+    open_, high, low, close = _ohlc()
+    window = 21
+
+    parkinson = Parkinson(window, tickers=close.shape[1])
+    streamed = numpy.array([parkinson.update(h, l) for h, l in zip(high, low)])
+    batch = parkinson_volatility(high, low, window)
+    assert numpy.nanmax(numpy.abs(streamed - batch)) < 1e-12
+    assert numpy.isnan(batch[window - 2]).all() and not numpy.isnan(batch[window - 1]).any()
+
+    garman_klass = GarmanKlass(window, tickers=close.shape[1])
+    streamed = numpy.array([garman_klass.update(*bar) for bar in zip(open_, high, low, close)])
+    batch = garman_klass_volatility(open_, high, low, close, window)
+    assert numpy.nanmax(numpy.abs(streamed - batch)) < 1e-12
+
+
+def test_ewma():
+    _, _, _, close = _ohlc(bars=1000)
+    estimator = EWMA(0.94, tickers=close.shape[1])
+    streamed = numpy.array([estimator.update(row) for row in close])
+    batch = ewma_volatility(close, 0.94)
+    assert numpy.nanmax(numpy.abs(streamed - batch)) < 1e-12
+    print("EWMA volatility : %s" % batch[-1])
+    assert numpy.all(numpy.abs(batch[-1] - 0.3) < 0.15)